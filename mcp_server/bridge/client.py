@@ -10,6 +10,11 @@ import time
 import uuid
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
 
 # IPC directory (must match renderdoc_extension/socket_server.py)
 IPC_DIR = os.path.join(tempfile.gettempdir(), "renderdoc_mcp")
@@ -77,6 +82,20 @@ REQUEST_CLAIM_GRACE = max(
 )
 DISABLE_LEGACY_FALLBACK = _env_truthy("RENDERDOC_MCP_DISABLE_LEGACY_FALLBACK", "0")
 
+# Waits on the extension start polling fast and back off, so quick requests
+# aren't rounded up to a whole fixed poll interval. This backoff stands in for
+# a shared-memory request ring: multiprocessing.shared_memory needs Python
+# 3.8+ while RenderDoc's extension runs on an embedded 3.6, and eventfd-style
+# signalling doesn't exist on Windows, the main D3D11 platform.
+POLL_INTERVAL_MIN = 0.002
+POLL_INTERVAL_MAX = 0.05
+
+
+def _poll_sleep(delay: float) -> float:
+    """Sleep for delay and return the next (backed-off) poll delay."""
+    time.sleep(delay)
+    return min(delay * 2.0, POLL_INTERVAL_MAX)
+
 
 class RenderDocBridgeError(Exception):
     """Error communicating with RenderDoc bridge"""
@@ -128,11 +147,27 @@ def _request_file_path_for(request_id: str) -> str:
 
 def _write_json_atomic(path: str, payload: dict[str, Any]) -> None:
     tmp_path = "%s.tmp.%d.%s" % (path, os.getpid(), uuid.uuid4().hex)
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f)
+    if orjson is not None:
+        data = orjson.dumps(payload)
+    else:
+        data = json.dumps(payload).encode("utf-8")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
     os.replace(tmp_path, path)
 
 
+def _decode_json(raw: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN/Infinity tokens the extension's stdlib
+            # encoder emits for non-finite floats; only a stdlib failure
+            # means a partial write.
+            pass
+    return json.loads(raw)
+
+
 def _enqueue_request(request: dict[str, Any], request_id: str, enqueue_timeout: float) -> str:
     """
     Enqueue request using per-request spool files.
@@ -224,13 +259,14 @@ def _fallback_to_legacy_request_if_needed(
 
     # Give modern extension a brief chance to claim request.<id>.json.
     deadline = time.time() + REQUEST_CLAIM_GRACE
+    poll_delay = POLL_INTERVAL_MIN
     while time.time() < deadline:
         if not os.path.exists(request_file_path):
             return request_file_path, False
         if _has_any_inflight_requests():
             # Bridge is actively working; don't force mode switch while busy.
             return request_file_path, False
-        time.sleep(0.02)
+        poll_delay = _poll_sleep(poll_delay)
 
     # Likely running an older extension build that only watches request.json.
     # Fallback is safe even when the extension is unhealthy; if nothing is
@@ -301,6 +337,7 @@ class RenderDocBridge:
 
             # Wait for response
             start_time = time.time()
+            poll_delay = POLL_INTERVAL_MIN
             stale_count = 0
             unhealthy_heartbeat_since: float | None = None
             response_paths = [response_file_path]
@@ -310,17 +347,18 @@ class RenderDocBridge:
                 response = None
                 matched_response_path = None
                 for candidate_path in response_paths:
-                    if not os.path.exists(candidate_path):
-                        continue
-
                     # Read response with retry loop for partial writes
                     for attempt in range(3):
                         try:
-                            with open(candidate_path, "r", encoding="utf-8") as f:
+                            with open(candidate_path, "rb") as f:
                                 raw = f.read()
-                            response = json.loads(raw)
+                            response = _decode_json(raw)
                             matched_response_path = candidate_path
                             break
+                        except FileNotFoundError:
+                            # Not written yet; probing with open() avoids a
+                            # separate exists() stat on every poll.
+                            break
                         except (json.JSONDecodeError, OSError):
                             if attempt < 2:
                                 time.sleep(0.05 * (attempt + 1))
@@ -401,8 +439,7 @@ class RenderDocBridge:
                         "Request timed out (%s)" % diag
                     )
 
-                # Poll interval
-                time.sleep(0.05)
+                poll_delay = _poll_sleep(poll_delay)
 
         except RenderDocBridgeError:
             raise
@@ -249,6 +249,7 @@ def get_action_timings(
 def get_shader_info(
     event_id: int,
     stage: Literal["vertex", "hull", "domain", "geometry", "pixel", "compute"],
+    sections: list[Literal["disassembly", "constant_buffers", "resources"]] | None = None,
 ) -> dict:
     """
     Get shader information for a specific stage at a given event.
@@ -256,10 +257,15 @@ def get_shader_info(
     Args:
         event_id: The event ID to inspect the shader at
         stage: The shader stage (vertex, hull, domain, geometry, pixel, compute)
+        sections: Only include these parts of the result (default: all).
+                  e.g. ["disassembly"] skips the constant buffer readback.
 
     Returns shader disassembly, constant buffer values, and resource bindings.
     """
-    return bridge.call("get_shader_info", {"event_id": event_id, "stage": stage})
+    params: dict[str, object] = {"event_id": event_id, "stage": stage}
+    if sections is not None:
+        params["sections"] = sections
+    return bridge.call("get_shader_info", params)
 
 
 @mcp.tool
@@ -335,12 +341,17 @@ def get_texture_data(
 
 
 @mcp.tool
-def get_pipeline_state(event_id: int) -> dict:
+def get_pipeline_state(event_id: int, base_event_id: int | None = None) -> dict:
     """
     Get the full graphics pipeline state at a specific event.
 
     Args:
         event_id: The event ID to get pipeline state at
+        base_event_id: Optional event to diff against. When set, only the
+                       top-level sections that differ from the state at
+                       base_event_id are returned under "changed", with
+                       "unchanged"/"removed" section name lists. Useful when
+                       stepping through consecutive draws.
 
     Returns detailed pipeline state including:
     - Bound shaders with entry points for each stage
@@ -351,7 +362,10 @@ def get_pipeline_state(event_id: int) -> dict:
     - Render targets and depth target
     - Viewports and input assembly state
     """
-    return bridge.call("get_pipeline_state", {"event_id": event_id})
+    params: dict[str, object] = {"event_id": event_id}
+    if base_event_id is not None:
+        params["base_event_id"] = base_event_id
+    return bridge.call("get_pipeline_state", params)
 
 
 @mcp.tool
@@ -59,7 +59,17 @@ class RenderDocFacade:
 
     def open_capture(self, capture_path):
         """Open a capture file in RenderDoc"""
-        return self._capture.open_capture(capture_path)
+        result = self._capture.open_capture(capture_path)
+        if not result.get("already_loaded"):
+            self._invalidate_caches()
+        return result
+
+    def _invalidate_caches(self):
+        """Drop capture-scoped service caches after a new capture load"""
+        self._analysis.invalidate_caches()
+        self._pipeline.invalidate_caches()
+        self._resource.invalidate_caches()
+        self._search.invalidate_caches()
 
     # ==================== Draw Call / Action Operations ====================
 
@@ -146,13 +156,13 @@ class RenderDocFacade:
 
     # ==================== Pipeline Operations ====================
 
-    def get_shader_info(self, event_id, stage):
+    def get_shader_info(self, event_id, stage, sections=None):
         """Get shader information for a specific stage"""
-        return self._pipeline.get_shader_info(event_id, stage)
+        return self._pipeline.get_shader_info(event_id, stage, sections)
 
-    def get_pipeline_state(self, event_id):
+    def get_pipeline_state(self, event_id, base_event_id=None):
         """Get full pipeline state at an event"""
-        return self._pipeline.get_pipeline_state(event_id)
+        return self._pipeline.get_pipeline_state(event_id, base_event_id)
 
     # ==================== LLM-Focused High-Level Analysis ====================
 
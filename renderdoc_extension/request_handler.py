@@ -162,7 +162,8 @@ class RequestHandler:
             raise ValueError("event_id is required")
         if stage is None:
             raise ValueError("stage is required")
-        return self.facade.get_shader_info(int(event_id), stage)
+        sections = params.get("sections")
+        return self.facade.get_shader_info(int(event_id), stage, sections)
 
     def _handle_get_buffer_contents(self, params):
         """Handle get_buffer_contents request"""
@@ -205,7 +206,10 @@ class RequestHandler:
         event_id = params.get("event_id")
         if event_id is None:
             raise ValueError("event_id is required")
-        return self.facade.get_pipeline_state(int(event_id))
+        base_event_id = params.get("base_event_id")
+        if base_event_id is not None:
+            base_event_id = int(base_event_id)
+        return self.facade.get_pipeline_state(int(event_id), base_event_id)
 
     def _handle_get_event_insight(self, params):
         """Handle get_event_insight request"""
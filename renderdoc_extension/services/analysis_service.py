@@ -4,9 +4,115 @@ LLM-oriented analysis service for RenderDoc.
 Provides compact, high-signal snapshots that reduce MCP round-trips.
 """
 
+import heapq
+import operator
+from collections import namedtuple
+from array import array
+
 import renderdoc as rd
 
-from ..utils import Helpers, Serializers
+from ..utils import CaptureCache, Helpers, Parsers, Serializers
+
+
+_ACTION_FIELDS = operator.attrgetter(
+    "eventId",
+    "actionId",
+    "flags",
+    "numIndices",
+    "numInstances",
+    "baseVertex",
+    "vertexOffset",
+    "instanceOffset",
+    "indexOffset",
+)
+
+_FLAG_DRAWCALL = int(rd.ActionFlags.Drawcall)
+_FLAG_DISPATCH = int(rd.ActionFlags.Dispatch)
+_FLAG_PUSH_MARKER = int(rd.ActionFlags.PushMarker)
+_FLAG_SET_MARKER = int(rd.ActionFlags.SetMarker)
+_FLAG_POP_MARKER = int(rd.ActionFlags.PopMarker)
+_FLAG_CLEAR = int(rd.ActionFlags.Clear)
+_FLAG_COPY = int(rd.ActionFlags.Copy)
+_FLAG_PRESENT = int(rd.ActionFlags.Present)
+_FLAG_MARKER_SCOPE = _FLAG_PUSH_MARKER | _FLAG_SET_MARKER
+_FLAG_ANY_MARKER = _FLAG_MARKER_SCOPE | _FLAG_POP_MARKER
+
+_SAMPLER_FIELDS = (
+    ("addressU", "address_u"),
+    ("addressV", "address_v"),
+    ("addressW", "address_w"),
+    ("filter", "filter"),
+    ("maxAnisotropy", "max_anisotropy"),
+    ("minLOD", "min_lod"),
+    ("maxLOD", "max_lod"),
+    ("mipLODBias", "mip_lod_bias"),
+)
+
+# Amplification/Mesh only exist in newer RenderDoc builds.
+_STAGE_NAMES = {
+    int(getattr(rd.ShaderStage, name)): name.lower()
+    for name in (
+        "Vertex",
+        "Hull",
+        "Domain",
+        "Geometry",
+        "Pixel",
+        "Compute",
+        "Amplification",
+        "Mesh",
+    )
+    if hasattr(rd.ShaderStage, name)
+}
+
+# str.isascii is 3.7+; RenderDoc's embedded 3.6 always takes the slow path.
+_STR_ISASCII = getattr(str, "isascii", None)
+
+_ResourceMaps = namedtuple(
+    "_ResourceMaps", ("textures", "buffers", "names", "texture_strings")
+)
+
+
+class _MarkerScan:
+    """
+    Per-marker accumulator updated once for every action in the subtree.
+
+    Only the markers selected for the overview are turned into dicts.
+    """
+
+    __slots__ = (
+        "action",
+        "first_event_id",
+        "last_event_id",
+        "node_count",
+        "draw_calls",
+        "dispatches",
+        "gpu_time_ms",
+    )
+
+    def __init__(self, action):
+        self.action = action
+        self.first_event_id = action.eventId
+        self.last_event_id = action.eventId
+        self.node_count = 0
+        self.draw_calls = 0
+        self.dispatches = 0
+        self.gpu_time_ms = 0.0
+
+    def to_dict(self, structured_file):
+        action = self.action
+        return {
+            "name": action.GetName(structured_file),
+            "event_id": action.eventId,
+            "first_event_id": self.first_event_id,
+            "last_event_id": self.last_event_id,
+            "child_count": self.node_count - 1,
+            "draw_calls": self.draw_calls,
+            "dispatches": self.dispatches,
+            "gpu_time_ms": round(self.gpu_time_ms, 6),
+        }
+
+
+_MARKER_RANK_KEY = operator.attrgetter("gpu_time_ms", "draw_calls", "dispatches")
 
 
 class AnalysisService:
@@ -15,6 +121,11 @@ class AnalysisService:
     def __init__(self, ctx, invoke_fn):
         self.ctx = ctx
         self._invoke = invoke_fn
+        self._cache = CaptureCache(ctx)
+
+    def invalidate_caches(self):
+        """Drop capture-scoped caches (called after a capture is loaded)."""
+        self._cache.clear()
 
     def get_event_insight(
         self,
@@ -37,28 +148,27 @@ class AnalysisService:
         result = {"data": None, "error": None}
 
         def callback(controller):
-            controller.SetFrameEvent(event_id, True)
-
+            # Reject unknown events before paying for a replay.
             action = self.ctx.GetAction(event_id)
             if not action:
                 result["error"] = "No action at event %d" % event_id
                 return
 
+            controller.SetFrameEvent(event_id, True)
+
             structured_file = controller.GetStructuredFile()
             pipe = controller.GetPipelineState()
-            tex_map, buf_map = self._build_resource_maps(controller)
+            resource_maps = self._get_resource_maps(controller)
 
-            marker_path = self._find_marker_path(
-                controller.GetRootActions(), structured_file, event_id
-            )
+            marker_paths = self._get_marker_path_map(controller, structured_file)
+            marker_path = list(marker_paths.get(event_id, ()))
             action_info = self._serialize_action(action, structured_file)
-            output_info = self._collect_output_state(controller, pipe, tex_map, buf_map)
+            output_info = self._collect_output_state(controller, pipe, resource_maps)
             ia_info = self._collect_input_assembly_state(controller, pipe)
             stage_info = self._collect_stage_state(
                 controller,
                 pipe,
-                tex_map,
-                buf_map,
+                resource_maps,
                 include_shader_disassembly=include_shader_disassembly,
                 include_shader_constants=include_shader_constants,
                 max_resources_per_stage=max_resources_per_stage,
@@ -118,15 +228,26 @@ class AnalysisService:
         max_markers = max(1, min(int(max_markers), 64))
         event_insight_budget = max(0, min(int(event_insight_budget), 8))
         max_resources_per_stage = max(1, min(int(max_resources_per_stage), 24))
+        marker_filter_lc = str(marker_filter).lower() if marker_filter else None
+        if event_id_min is not None:
+            event_id_min = int(event_id_min)
+        if event_id_max is not None:
+            event_id_max = int(event_id_max)
 
         result = {"data": None, "error": None}
 
         def callback(controller):
             root_actions = controller.GetRootActions()
             structured_file = controller.GetStructuredFile()
-            flat_actions = Helpers.flatten_actions(root_actions)
 
-            action_rows = []
+            # Column-oriented rows: only the selected hotspots are ever
+            # materialized as dicts, so keep per-action storage flat.
+            event_ids = array("L")
+            names = []
+            flags_lists = []
+            marker_paths = []
+            num_indices = array("L")
+            num_instances = array("L")
             stats = {
                 "draw_calls": 0,
                 "dispatches": 0,
@@ -136,57 +257,71 @@ class AnalysisService:
                 "markers": 0,
             }
             non_marker_count = 0
+            # Sibling actions share the same marker_path tuple, so the filter
+            # only needs re-evaluating when the path object changes.
+            filter_path = None
+            filter_match = True
+            # This walk already yields every event's marker path; keep them so
+            # a follow-up get_event_insight doesn't have to walk the tree again.
+            path_map = None if self._cache.has("marker_paths") else {}
 
             for action, marker_path in self._iter_actions_with_marker_path(
                 root_actions, structured_file
             ):
-                flags = Serializers.serialize_flags(action.flags)
-                flags_set = set(flags)
-                is_marker = (
-                    "PushMarker" in flags_set
-                    or "SetMarker" in flags_set
-                    or "PopMarker" in flags_set
-                )
+                if path_map is not None:
+                    path_map[action.eventId] = marker_path
+                raw_flags = action.flags
+                is_marker = raw_flags & _FLAG_ANY_MARKER
                 if is_marker:
                     stats["markers"] += 1
                 else:
                     non_marker_count += 1
 
-                if "Drawcall" in flags_set:
+                if raw_flags & _FLAG_DRAWCALL:
                     stats["draw_calls"] += 1
-                if "Dispatch" in flags_set:
+                if raw_flags & _FLAG_DISPATCH:
                     stats["dispatches"] += 1
-                if "Clear" in flags_set:
+                if raw_flags & _FLAG_CLEAR:
                     stats["clears"] += 1
-                if "Copy" in flags_set:
+                if raw_flags & _FLAG_COPY:
                     stats["copies"] += 1
-                if "Present" in flags_set:
+                if raw_flags & _FLAG_PRESENT:
                     stats["presents"] += 1
 
                 if is_marker:
                     continue
 
-                if event_id_min is not None and action.eventId < int(event_id_min):
+                if event_id_min is not None and action.eventId < event_id_min:
                     continue
-                if event_id_max is not None and action.eventId > int(event_id_max):
+                if event_id_max is not None and action.eventId > event_id_max:
                     continue
-                if marker_filter:
-                    marker_text = "/".join(marker_path).lower()
-                    if str(marker_filter).lower() not in marker_text:
+                if marker_filter_lc is not None:
+                    if marker_path is not filter_path:
+                        filter_path = marker_path
+                        filter_match = marker_filter_lc in "/".join(marker_path).lower()
+                    if not filter_match:
                         continue
 
-                action_rows.append(
-                    {
-                        "event_id": action.eventId,
-                        "name": action.GetName(structured_file),
-                        "flags": flags,
-                        "marker_path": marker_path,
-                        "num_indices": action.numIndices,
-                        "num_instances": action.numInstances,
-                    }
-                )
-
-            timings_payload = self._collect_frame_timings(controller, action_rows)
+                event_ids.append(action.eventId)
+                names.append(action.GetName(structured_file))
+                # Only rows that survive the filters need flag names
+                flags_lists.append(Serializers.serialize_flags(raw_flags))
+                marker_paths.append(marker_path)
+                num_indices.append(action.numIndices)
+                num_instances.append(action.numInstances)
+
+            if path_map is not None:
+                self._cache.put("marker_paths", path_map)
+
+            action_rows = (
+                event_ids,
+                names,
+                flags_lists,
+                marker_paths,
+                num_indices,
+                num_instances,
+            )
+            timings_payload = self._collect_frame_timings(controller, event_ids)
             hotspots = self._build_hotspots(
                 action_rows,
                 timings_payload["timing_map"],
@@ -208,7 +343,7 @@ class AnalysisService:
             digest = {
                 "schema_version": "frame_digest.v1",
                 "api": str(controller.GetAPIProperties().pipelineType),
-                "total_actions": len(flat_actions),
+                "total_actions": stats["markers"] + non_marker_count,
                 "non_marker_actions": non_marker_count,
                 "statistics": stats,
                 "timing": {
@@ -223,10 +358,11 @@ class AnalysisService:
             }
 
             if include_event_insights and hotspots and event_insight_budget > 0:
+                resource_maps = self._get_resource_maps(controller)
                 digest["hotspot_event_insights"] = self._collect_hotspot_insights(
                     controller,
-                    root_actions,
                     structured_file,
+                    resource_maps,
                     hotspots[:event_insight_budget],
                     max_resources_per_stage=max_resources_per_stage,
                 )
@@ -240,25 +376,35 @@ class AnalysisService:
         return result["data"]
 
     def _serialize_action(self, action, structured_file):
+        (
+            event_id,
+            action_id,
+            flags,
+            num_indices,
+            num_instances,
+            base_vertex,
+            vertex_offset,
+            instance_offset,
+            index_offset,
+        ) = _ACTION_FIELDS(action)
         return {
-            "event_id": action.eventId,
-            "action_id": action.actionId,
+            "event_id": event_id,
+            "action_id": action_id,
             "name": action.GetName(structured_file),
-            "flags": Serializers.serialize_flags(action.flags),
-            "num_indices": action.numIndices,
-            "num_instances": action.numInstances,
-            "base_vertex": action.baseVertex,
-            "vertex_offset": action.vertexOffset,
-            "instance_offset": action.instanceOffset,
-            "index_offset": action.indexOffset,
+            "flags": Serializers.serialize_flags(flags),
+            "num_indices": num_indices,
+            "num_instances": num_instances,
+            "base_vertex": base_vertex,
+            "vertex_offset": vertex_offset,
+            "instance_offset": instance_offset,
+            "index_offset": index_offset,
         }
 
     def _collect_stage_state(
         self,
         controller,
         pipe,
-        tex_map,
-        buf_map,
+        resource_maps,
         include_shader_disassembly,
         include_shader_constants,
         max_resources_per_stage,
@@ -272,7 +418,7 @@ class AnalysisService:
             if shader == rd.ResourceId.Null():
                 continue
 
-            stage_name = self._stage_name(stage)
+            stage_name = _STAGE_NAMES.get(int(stage)) or str(stage).lower()
             reflection = pipe.GetShaderReflection(stage)
             entry_point = pipe.GetShaderEntryPoint(stage)
 
@@ -299,13 +445,15 @@ class AnalysisService:
                 },
             }
 
-            shader_name = self._safe_resource_name(shader)
+            shader_name = self._lookup_resource_name(
+                shader, Parsers.resource_key(shader), resource_maps
+            )
             if shader_name:
                 stage_payload["shader"]["resource_name"] = shader_name
 
             # SRVs
             srv_payload = self._collect_read_only_resources(
-                pipe, stage, tex_map, buf_map, max_resources_per_stage
+                pipe, stage, resource_maps, max_resources_per_stage
             )
             stage_payload["resource_counts"]["srvs"] = srv_payload["count"]
             stage_payload["srvs_preview"] = srv_payload["preview"]
@@ -313,7 +461,7 @@ class AnalysisService:
 
             # UAVs
             uav_payload = self._collect_read_write_resources(
-                pipe, stage, tex_map, buf_map, max_resources_per_stage
+                pipe, stage, resource_maps, max_resources_per_stage
             )
             stage_payload["resource_counts"]["uavs"] = uav_payload["count"]
             stage_payload["uavs_preview"] = uav_payload["preview"]
@@ -351,47 +499,50 @@ class AnalysisService:
         return stages
 
     def _collect_read_only_resources(
-        self, pipe, stage, tex_map, buf_map, max_resources_per_stage
+        self, pipe, stage, resource_maps, max_resources_per_stage
     ):
         preview = []
         count = 0
         truncated = False
-        get_constant_buffer = getattr(pipe, "GetConstantBuffer", None)
-        can_read_values = callable(get_constant_buffer)
 
         try:
             srvs = pipe.GetReadOnlyResources(stage, False)
-            for srv in srvs:
-                desc = getattr(srv, "descriptor", None)
-                if not desc:
-                    continue
-                res_id = getattr(desc, "resource", rd.ResourceId.Null())
-                if res_id == rd.ResourceId.Null():
-                    continue
-
-                count += 1
-                if len(preview) >= max_resources_per_stage:
-                    truncated = True
-                    continue
-
-                slot = getattr(getattr(srv, "access", None), "index", len(preview))
-                item = {
-                    "slot": slot,
-                    "resource_id": str(res_id),
-                    "first_mip": getattr(desc, "firstMip", 0),
-                    "num_mips": getattr(desc, "numMips", 1),
-                    "first_slice": getattr(desc, "firstSlice", 0),
-                    "num_slices": getattr(desc, "numSlices", 1),
-                }
-                self._append_resource_identity(item, res_id, tex_map, buf_map)
-                preview.append(item)
         except Exception as e:
             preview.append({"error": str(e)})
+            return {"count": count, "preview": preview, "truncated": truncated}
+
+        for srv in srvs:
+            desc = getattr(srv, "descriptor", None)
+            if not desc:
+                continue
+            res_id = getattr(desc, "resource", rd.ResourceId.Null())
+            if res_id == rd.ResourceId.Null():
+                continue
+
+            count += 1
+            if len(preview) >= max_resources_per_stage:
+                truncated = True
+                continue
+
+            slot = getattr(getattr(srv, "access", None), "index", len(preview))
+            item = {
+                "slot": slot,
+                "resource_id": str(res_id),
+                "first_mip": getattr(desc, "firstMip", 0),
+                "num_mips": getattr(desc, "numMips", 1),
+                "first_slice": getattr(desc, "firstSlice", 0),
+                "num_slices": getattr(desc, "numSlices", 1),
+            }
+            try:
+                self._append_resource_identity(item, res_id, resource_maps)
+            except Exception as e:
+                item["error"] = str(e)
+            preview.append(item)
 
         return {"count": count, "preview": preview, "truncated": truncated}
 
     def _collect_read_write_resources(
-        self, pipe, stage, tex_map, buf_map, max_resources_per_stage
+        self, pipe, stage, resource_maps, max_resources_per_stage
     ):
         preview = []
         count = 0
@@ -399,30 +550,35 @@ class AnalysisService:
 
         try:
             uavs = pipe.GetReadWriteResources(stage, False)
-            for uav in uavs:
-                desc = getattr(uav, "descriptor", None)
-                if not desc:
-                    continue
-                res_id = getattr(desc, "resource", rd.ResourceId.Null())
-                if res_id == rd.ResourceId.Null():
-                    continue
-
-                count += 1
-                if len(preview) >= max_resources_per_stage:
-                    truncated = True
-                    continue
-
-                slot = getattr(getattr(uav, "access", None), "index", len(preview))
-                item = {
-                    "slot": slot,
-                    "resource_id": str(res_id),
-                    "first_element": getattr(desc, "firstMip", 0),
-                    "num_elements": getattr(desc, "numMips", 0),
-                }
-                self._append_resource_identity(item, res_id, tex_map, buf_map)
-                preview.append(item)
         except Exception as e:
             preview.append({"error": str(e)})
+            return {"count": count, "preview": preview, "truncated": truncated}
+
+        for uav in uavs:
+            desc = getattr(uav, "descriptor", None)
+            if not desc:
+                continue
+            res_id = getattr(desc, "resource", rd.ResourceId.Null())
+            if res_id == rd.ResourceId.Null():
+                continue
+
+            count += 1
+            if len(preview) >= max_resources_per_stage:
+                truncated = True
+                continue
+
+            slot = getattr(getattr(uav, "access", None), "index", len(preview))
+            item = {
+                "slot": slot,
+                "resource_id": str(res_id),
+                "first_element": getattr(desc, "firstMip", 0),
+                "num_elements": getattr(desc, "numMips", 0),
+            }
+            try:
+                self._append_resource_identity(item, res_id, resource_maps)
+            except Exception as e:
+                item["error"] = str(e)
+            preview.append(item)
 
         return {"count": count, "preview": preview, "truncated": truncated}
 
@@ -433,32 +589,25 @@ class AnalysisService:
 
         try:
             samplers = pipe.GetSamplers(stage, False)
-            for sampler in samplers:
-                count += 1
-                if len(preview) >= max_resources_per_stage:
-                    truncated = True
-                    continue
-
-                slot = getattr(getattr(sampler, "access", None), "index", len(preview))
-                desc = getattr(sampler, "descriptor", None)
-                item = {"slot": slot}
-                if desc:
-                    for attr, key in [
-                        ("addressU", "address_u"),
-                        ("addressV", "address_v"),
-                        ("addressW", "address_w"),
-                        ("filter", "filter"),
-                        ("maxAnisotropy", "max_anisotropy"),
-                        ("minLOD", "min_lod"),
-                        ("maxLOD", "max_lod"),
-                        ("mipLODBias", "mip_lod_bias"),
-                    ]:
-                        val = getattr(desc, attr, None)
-                        if val is not None:
-                            item[key] = str(val)
-                preview.append(item)
         except Exception as e:
             preview.append({"error": str(e)})
+            return {"count": count, "preview": preview, "truncated": truncated}
+
+        for sampler in samplers:
+            count += 1
+            if len(preview) >= max_resources_per_stage:
+                truncated = True
+                continue
+
+            slot = getattr(getattr(sampler, "access", None), "index", len(preview))
+            desc = getattr(sampler, "descriptor", None)
+            item = {"slot": slot}
+            if desc:
+                for attr, key in _SAMPLER_FIELDS:
+                    val = getattr(desc, attr, None)
+                    if val is not None:
+                        item[key] = str(val)
+            preview.append(item)
 
         return {"count": count, "preview": preview, "truncated": truncated}
 
@@ -479,6 +628,9 @@ class AnalysisService:
         if not reflection:
             return {"count": 0, "preview": preview, "truncated": False}
 
+        get_constant_buffer = getattr(pipe, "GetConstantBuffer", None)
+        can_read_values = callable(get_constant_buffer)
+
         for cb_index, cb in enumerate(reflection.constantBlocks):
             count += 1
             if len(preview) >= max_resources_per_stage:
@@ -518,7 +670,21 @@ class AnalysisService:
                             bind.byteOffset,
                             bind.byteSize,
                         )
-                        serialized = Serializers.serialize_variables(raw_vars)
+                        layouts = self._cache.get("cbuffer_layouts", dict)
+                        layout_key = (
+                            int(stage),
+                            Parsers.resource_key(reflection.resourceId),
+                            reflection.entryPoint,
+                            cb_index,
+                        )
+                        layout = layouts.get(layout_key)
+                        if layout is None:
+                            layout = layouts[layout_key] = Serializers.variable_layout(
+                                raw_vars
+                            )
+                        serialized = Serializers.serialize_variables_with_layout(
+                            raw_vars, layout
+                        )
                         if len(serialized) > max_cbuffer_variables:
                             entry["variables_values"] = serialized[:max_cbuffer_variables]
                             entry["variables_truncated"] = True
@@ -539,21 +705,28 @@ class AnalysisService:
         payload = {"text": "", "truncated": False}
         try:
             targets = controller.GetDisassemblyTargets(True)
-            if not targets:
-                return payload
+        except Exception as e:
+            payload["error"] = str(e)
+            return payload
+        if not targets:
+            return payload
+
+        try:
             disasm = controller.DisassembleShader(
                 pipe.GetGraphicsPipelineObject(), reflection, targets[0]
             )
-            if disassembly_char_limit > 0 and len(disasm) > disassembly_char_limit:
-                payload["text"] = disasm[:disassembly_char_limit]
-                payload["truncated"] = True
-            else:
-                payload["text"] = disasm
         except Exception as e:
             payload["error"] = str(e)
+            return payload
+
+        if disassembly_char_limit > 0 and len(disasm) > disassembly_char_limit:
+            payload["text"] = disasm[:disassembly_char_limit]
+            payload["truncated"] = True
+        else:
+            payload["text"] = disasm
         return payload
 
-    def _collect_output_state(self, controller, pipe, tex_map, buf_map):
+    def _collect_output_state(self, controller, pipe, resource_maps):
         info = {
             "render_targets": [],
             "depth_target": None,
@@ -573,13 +746,13 @@ class AnalysisService:
                     if res_id == rd.ResourceId.Null():
                         continue
                     item = {"index": i, "resource_id": str(res_id)}
-                    self._append_resource_identity(item, res_id, tex_map, buf_map)
+                    self._append_resource_identity(item, res_id, resource_maps)
                     info["render_targets"].append(item)
 
                 depth_id = self._extract_res_id(getattr(om, "depthTarget", None))
                 if depth_id != rd.ResourceId.Null():
                     item = {"resource_id": str(depth_id)}
-                    self._append_resource_identity(item, depth_id, tex_map, buf_map)
+                    self._append_resource_identity(item, depth_id, resource_maps)
                     info["depth_target"] = item
                     info["has_depth_target"] = True
             else:
@@ -593,13 +766,13 @@ class AnalysisService:
                         if res_id == rd.ResourceId.Null():
                             continue
                         item = {"index": i, "resource_id": str(res_id)}
-                        self._append_resource_identity(item, res_id, tex_map, buf_map)
+                        self._append_resource_identity(item, res_id, resource_maps)
                         info["render_targets"].append(item)
 
                     depth_id = self._extract_res_id(getattr(om11, "depthTarget", None))
                     if depth_id != rd.ResourceId.Null():
                         item = {"resource_id": str(depth_id)}
-                        self._append_resource_identity(item, depth_id, tex_map, buf_map)
+                        self._append_resource_identity(item, depth_id, resource_maps)
                         info["depth_target"] = item
                         info["has_depth_target"] = True
         except Exception as e:
@@ -789,34 +962,36 @@ class AnalysisService:
     def _recommend_next_calls(
         self, event_id, stage_info, output_info, include_shader_disassembly
     ):
-        calls = ["get_pipeline_state(event_id=%d)" % event_id]
+        calls = [f"get_pipeline_state(event_id={event_id})"]
 
         if not include_shader_disassembly:
-            for stage in ["vertex", "pixel", "compute"]:
-                if stage in stage_info:
-                    calls.append(
-                        "get_shader_info(event_id=%d, stage='%s')" % (event_id, stage)
-                    )
+            calls.extend(
+                f"get_shader_info(event_id={event_id}, stage='{stage}')"
+                for stage in ("vertex", "pixel", "compute")
+                if stage in stage_info
+            )
 
-        for rt in output_info.get("render_targets", [])[:2]:
-            calls.append("get_texture_info(resource_id='%s')" % rt["resource_id"])
+        calls.extend(
+            f"get_texture_info(resource_id='{rt['resource_id']}')"
+            for rt in output_info.get("render_targets", [])[:2]
+        )
         depth = output_info.get("depth_target")
         if depth and depth.get("resource_id"):
-            calls.append("get_texture_info(resource_id='%s')" % depth["resource_id"])
+            calls.append(f"get_texture_info(resource_id='{depth['resource_id']}')")
 
         return calls
 
     @staticmethod
     def _recommend_frame_next_calls(hotspots):
         calls = ["get_frame_summary()"]
-        for hotspot in hotspots[:5]:
-            event_id = hotspot.get("event_id")
-            if event_id is None:
-                continue
-            calls.append("get_event_insight(event_id=%d)" % event_id)
+        calls.extend(
+            f"get_event_insight(event_id={hotspot['event_id']})"
+            for hotspot in hotspots[:5]
+            if hotspot.get("event_id") is not None
+        )
         return calls
 
-    def _collect_frame_timings(self, controller, action_rows):
+    def _collect_frame_timings(self, controller, event_ids):
         try:
             counters = controller.EnumerateCounters()
             if rd.GPUCounter.EventGPUDuration not in counters:
@@ -825,165 +1000,173 @@ class AnalysisService:
             counter_desc = controller.DescribeCounter(rd.GPUCounter.EventGPUDuration)
             counter_results = controller.FetchCounters([rd.GPUCounter.EventGPUDuration])
             target_counter = int(rd.GPUCounter.EventGPUDuration)
-            relevant_ids = {row["event_id"] for row in action_rows}
-            timing_map = {}
-            for row in counter_results:
-                if row.counter != target_counter:
-                    continue
-                if row.eventId not in relevant_ids:
-                    continue
-                timing_map[row.eventId] = float(row.value.d) * 1000.0
+            relevant_ids = set(event_ids)
+            # Probed once per capture: whether FetchCounters returns only the
+            # counters that were asked for, letting later passes skip the check.
+            single_counter_fetch = self._cache.get(
+                "single_counter_fetch",
+                lambda: all(row.counter == target_counter for row in counter_results),
+            )
+            if single_counter_fetch:
+                timing_map = {
+                    row.eventId: row.value.d * 1000.0
+                    for row in counter_results
+                    if row.eventId in relevant_ids
+                }
+            else:
+                timing_map = {
+                    row.eventId: row.value.d * 1000.0
+                    for row in counter_results
+                    if row.eventId in relevant_ids and row.counter == target_counter
+                }
             return {"available": True, "unit": str(counter_desc.unit), "timing_map": timing_map}
         except Exception:
             return {"available": False, "unit": None, "timing_map": {}}
 
     @staticmethod
     def _build_hotspots(action_rows, timing_map, max_hotspots):
+        """
+        Select the slowest actions from column-oriented rows.
+
+        action_rows is the (event_ids, names, flags, marker_paths, num_indices,
+        num_instances) tuple built by get_frame_digest; dicts are only created
+        for the selected hotspots.
+        """
+        (
+            event_ids,
+            names,
+            flags_lists,
+            marker_paths,
+            num_indices,
+            num_instances,
+        ) = action_rows
+        durations = [timing_map.get(event_id, 0.0) for event_id in event_ids]
+        order = heapq.nlargest(
+            max_hotspots, range(len(event_ids)), key=durations.__getitem__
+        )
+
         hotspots = []
-        for row in action_rows:
-            event_id = row["event_id"]
-            duration_ms = float(timing_map.get(event_id, 0.0))
+        for rank, idx in enumerate(order, start=1):
             hotspots.append(
                 {
-                    "event_id": event_id,
-                    "name": row["name"],
-                    "flags": row["flags"],
-                    "marker_path": row["marker_path"],
-                    "duration_ms": round(duration_ms, 6),
-                    "num_indices": row["num_indices"],
-                    "num_instances": row["num_instances"],
+                    "event_id": event_ids[idx],
+                    "name": names[idx],
+                    "flags": flags_lists[idx],
+                    "marker_path": list(marker_paths[idx]),
+                    "duration_ms": round(durations[idx], 6),
+                    "num_indices": num_indices[idx],
+                    "num_instances": num_instances[idx],
+                    "rank": rank,
                 }
             )
-
-        hotspots.sort(key=lambda item: item["duration_ms"], reverse=True)
-        limited = hotspots[:max_hotspots]
-        for idx, item in enumerate(limited, start=1):
-            item["rank"] = idx
-        return limited
+        return hotspots
 
     def _build_marker_overview(
         self, root_actions, structured_file, timing_map, max_markers
     ):
         markers = []
         for action in root_actions:
-            flags = action.flags
-            if not (
-                (flags & rd.ActionFlags.PushMarker) or (flags & rd.ActionFlags.SetMarker)
-            ):
+            if not action.flags & _FLAG_MARKER_SCOPE:
                 continue
+            markers.append(self._scan_marker_subtree(action, timing_map))
 
-            scan = self._scan_marker_subtree(action, timing_map)
-            marker = {
-                "name": action.GetName(structured_file),
-                "event_id": action.eventId,
-                "first_event_id": scan["first_event_id"],
-                "last_event_id": scan["last_event_id"],
-                "child_count": Helpers.count_children(action),
-                "draw_calls": scan["draw_calls"],
-                "dispatches": scan["dispatches"],
-                "gpu_time_ms": round(scan["gpu_time_ms"], 6),
-            }
-            markers.append(marker)
-
-        markers.sort(
-            key=lambda item: (
-                item.get("gpu_time_ms", 0.0),
-                item.get("draw_calls", 0),
-                item.get("dispatches", 0),
-            ),
-            reverse=True,
-        )
-        return markers[:max_markers]
+        top = heapq.nlargest(max_markers, markers, key=_MARKER_RANK_KEY)
+        return [scan.to_dict(structured_file) for scan in top]
 
     def _scan_marker_subtree(self, action, timing_map):
-        summary = {
-            "first_event_id": action.eventId,
-            "last_event_id": action.eventId,
-            "draw_calls": 0,
-            "dispatches": 0,
-            "gpu_time_ms": 0.0,
-        }
+        summary = _MarkerScan(action)
 
-        def _visit(node):
-            flags = Serializers.serialize_flags(node.flags)
-            flags_set = set(flags)
+        stack = [action]
+        while stack:
+            node = stack.pop()
+            flags = node.flags
+            summary.node_count += 1
 
-            if node.eventId < summary["first_event_id"]:
-                summary["first_event_id"] = node.eventId
-            if node.eventId > summary["last_event_id"]:
-                summary["last_event_id"] = node.eventId
+            if node.eventId < summary.first_event_id:
+                summary.first_event_id = node.eventId
+            if node.eventId > summary.last_event_id:
+                summary.last_event_id = node.eventId
 
-            if "Drawcall" in flags_set:
-                summary["draw_calls"] += 1
-            if "Dispatch" in flags_set:
-                summary["dispatches"] += 1
+            if flags & _FLAG_DRAWCALL:
+                summary.draw_calls += 1
+            if flags & _FLAG_DISPATCH:
+                summary.dispatches += 1
 
-            summary["gpu_time_ms"] += float(timing_map.get(node.eventId, 0.0))
+            summary.gpu_time_ms += timing_map.get(node.eventId, 0.0)
 
-            for child in node.children or []:
-                _visit(child)
+            if node.children:
+                # Reversed so children pop in submission order.
+                stack.extend(reversed(node.children))
 
-        _visit(action)
         return summary
 
     def _collect_hotspot_insights(
         self,
         controller,
-        root_actions,
         structured_file,
+        resource_maps,
         hotspots,
         max_resources_per_stage=8,
     ):
-        tex_map, buf_map = self._build_resource_maps(controller)
-        insights = []
-        for hotspot in hotspots:
-            event_id = hotspot.get("event_id")
-            if event_id is None:
-                continue
+        # Replay forward through the frame instead of jumping back and forth
+        # between scattered hotspots, then report in hotspot (rank) order.
+        # Events only move forward here, so an unforced SetFrameEvent lets
+        # RenderDoc skip a replay when it is already at the requested event.
+        event_ids = [h.get("event_id") for h in hotspots if h.get("event_id") is not None]
+        # The digest walk already resolved each hotspot's marker path.
+        path_map = {
+            h["event_id"]: h["marker_path"]
+            for h in hotspots
+            if h.get("marker_path") is not None
+        }
+        by_event = {}
+        for event_id in sorted(set(event_ids)):
             try:
-                controller.SetFrameEvent(event_id, True)
                 action = self.ctx.GetAction(event_id)
                 if not action:
                     continue
+                controller.SetFrameEvent(event_id, False)
                 pipe = controller.GetPipelineState()
                 stage_info = self._collect_stage_state(
                     controller,
                     pipe,
-                    tex_map,
-                    buf_map,
+                    resource_maps,
                     include_shader_disassembly=False,
                     include_shader_constants=False,
                     max_resources_per_stage=max_resources_per_stage,
                     max_cbuffer_variables=12,
                     disassembly_char_limit=0,
                 )
-                output_info = self._collect_output_state(controller, pipe, tex_map, buf_map)
+                output_info = self._collect_output_state(controller, pipe, resource_maps)
                 action_info = self._serialize_action(action, structured_file)
                 heuristics = self._build_heuristics(action_info, stage_info, output_info)
-                insights.append(
-                    {
-                        "event_id": event_id,
-                        "marker_path": self._find_marker_path(
-                            root_actions, structured_file, event_id
-                        ),
-                        "stages_present": sorted(stage_info.keys()),
-                        "render_target_count": output_info.get("render_target_count", 0),
-                        "has_depth_target": output_info.get("has_depth_target", False),
-                        "heuristics": heuristics,
-                    }
-                )
+                marker_path = path_map.get(event_id)
+                if marker_path is None:
+                    marker_path = list(
+                        self._get_marker_path_map(controller, structured_file).get(
+                            event_id, ()
+                        )
+                    )
+                by_event[event_id] = {
+                    "event_id": event_id,
+                    "marker_path": marker_path,
+                    "stages_present": sorted(stage_info.keys()),
+                    "render_target_count": output_info.get("render_target_count", 0),
+                    "has_depth_target": output_info.get("has_depth_target", False),
+                    "heuristics": heuristics,
+                }
             except Exception as e:
-                insights.append({"event_id": event_id, "error": str(e)})
+                by_event[event_id] = {"event_id": event_id, "error": str(e)}
 
-        return insights
+        return [by_event[event_id] for event_id in event_ids if event_id in by_event]
 
-    def _append_resource_identity(self, item, resource_id, tex_map, buf_map):
-        name = self._safe_resource_name(resource_id)
+    def _append_resource_identity(self, item, resource_id, resource_maps):
+        key = Parsers.resource_key(resource_id)
+        name = self._lookup_resource_name(resource_id, key, resource_maps)
         if name:
             item["resource_name"] = name
 
-        key = str(resource_id)
-        tex = tex_map.get(key)
+        tex = resource_maps.textures.get(key)
         if tex is not None:
             item["type"] = "texture"
             item["width"] = tex.width
@@ -991,69 +1174,81 @@ class AnalysisService:
             item["depth"] = tex.depth
             item["array_size"] = tex.arraysize
             item["mip_levels"] = tex.mips
-            item["format"] = str(tex.format.Name())
-            item["dimension"] = str(tex.type)
+            # (format, dimension) strings, stringified once per texture
+            strings = resource_maps.texture_strings.get(key)
+            if strings is None:
+                strings = resource_maps.texture_strings[key] = (
+                    str(tex.format.Name()),
+                    str(tex.type),
+                )
+            item["format"], item["dimension"] = strings
             return
 
-        buf = buf_map.get(key)
+        buf = resource_maps.buffers.get(key)
         if buf is not None:
             item["type"] = "buffer"
             item["length"] = buf.length
 
+    def _lookup_resource_name(self, resource_id, key, resource_maps):
+        names = resource_maps.names
+        name = names.get(key)
+        if name is None:
+            # Only textures and buffers are pre-named; remember shaders etc.
+            # too, since the map lives as long as the capture does.
+            name = self._safe_resource_name(resource_id)
+            names[key] = name
+        return name
+
     def _safe_resource_name(self, resource_id):
         try:
             name = self.ctx.GetResourceName(resource_id)
             if not name:
                 return ""
+            if _STR_ISASCII is not None and _STR_ISASCII(name):
+                return name
             return name.encode("ascii", "replace").decode("ascii")
         except Exception:
             return ""
 
-    def _find_marker_path(self, actions, structured_file, target_event_id):
-        def _visit(current_actions, stack):
-            for action in current_actions:
-                flags = action.flags
-                is_push = bool(flags & rd.ActionFlags.PushMarker)
-                is_set = bool(flags & rd.ActionFlags.SetMarker)
-
-                next_stack = stack
-                if is_push or is_set:
-                    next_stack = stack + [action.GetName(structured_file)]
-
-                if action.eventId == target_event_id:
-                    return next_stack
-
-                if action.children:
-                    found = _visit(action.children, next_stack)
-                    if found is not None:
-                        return found
-            return None
-
-        found = _visit(actions, [])
-        return found or []
-
-    def _iter_actions_with_marker_path(self, actions, structured_file, stack=None):
-        if stack is None:
-            stack = []
-        for action in actions:
-            flags = action.flags
-            is_push = bool(flags & rd.ActionFlags.PushMarker)
-            is_set = bool(flags & rd.ActionFlags.SetMarker)
-            is_pop = bool(flags & rd.ActionFlags.PopMarker)
+    def _get_marker_path_map(self, controller, structured_file):
+        """Marker paths only depend on the action tree, so walk it once per capture."""
+        return self._cache.get(
+            "marker_paths",
+            lambda: self._build_marker_path_map(
+                controller.GetRootActions(), structured_file
+            ),
+        )
+
+    @classmethod
+    def _build_marker_path_map(cls, actions, structured_file):
+        """Map every eventId to its marker path tuple in one iterative walk."""
+        return {
+            action.eventId: path
+            for action, path in cls._iter_actions_with_marker_path(actions, structured_file)
+        }
+
+    @staticmethod
+    def _iter_actions_with_marker_path(actions, structured_file):
+        """Yield (action, marker_path) in submission order without recursion."""
+        # Each frame holds the remaining siblings and the marker path above them.
+        stack = [(iter(actions), ())]
+        while stack:
+            siblings, path = stack[-1]
+            action = next(siblings, None)
+            if action is None:
+                stack.pop()
+                continue
 
-            current_stack = stack
-            if is_push or is_set:
-                current_stack = stack + [action.GetName(structured_file)]
-            elif is_pop:
-                current_stack = stack[:-1] if stack else stack
+            flags = action.flags
+            if flags & _FLAG_MARKER_SCOPE:
+                path = path + (action.GetName(structured_file),)
+            elif flags & _FLAG_POP_MARKER:
+                path = path[:-1]
 
-            yield action, current_stack
+            yield action, path
 
             if action.children:
-                for child, child_stack in self._iter_actions_with_marker_path(
-                    action.children, structured_file, current_stack
-                ):
-                    yield child, child_stack
+                stack.append((iter(action.children), path))
 
     @staticmethod
     def _extract_res_id(obj):
@@ -1061,26 +1256,24 @@ class AnalysisService:
             return rd.ResourceId.Null()
         return getattr(obj, "resourceId", getattr(obj, "resource", rd.ResourceId.Null()))
 
-    @staticmethod
-    def _build_resource_maps(controller):
+    def _get_resource_maps(self, controller):
+        """Resource tables are frame-wide, so build them once per capture."""
+        return self._cache.get(
+            "resource_maps", lambda: self._build_resource_maps(controller)
+        )
+
+    def _build_resource_maps(self, controller):
         tex_map = {}
+        name_map = {}
         for tex in controller.GetTextures():
-            tex_map[str(tex.resourceId)] = tex
+            key = Parsers.resource_key(tex.resourceId)
+            tex_map[key] = tex
+            name_map[key] = self._safe_resource_name(tex.resourceId)
 
         buf_map = {}
         for buf in controller.GetBuffers():
-            buf_map[str(buf.resourceId)] = buf
-
-        return tex_map, buf_map
+            key = Parsers.resource_key(buf.resourceId)
+            buf_map[key] = buf
+            name_map[key] = self._safe_resource_name(buf.resourceId)
 
-    @staticmethod
-    def _stage_name(stage):
-        mapping = {
-            rd.ShaderStage.Vertex: "vertex",
-            rd.ShaderStage.Hull: "hull",
-            rd.ShaderStage.Domain: "domain",
-            rd.ShaderStage.Geometry: "geometry",
-            rd.ShaderStage.Pixel: "pixel",
-            rd.ShaderStage.Compute: "compute",
-        }
-        return mapping.get(stage, str(stage).lower())
+        return _ResourceMaps(tex_map, buf_map, name_map, {})
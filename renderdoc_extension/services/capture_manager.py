@@ -8,7 +8,17 @@ import tempfile
 import renderdoc as rd
 
 
+_TRACE_ENABLED = os.environ.get("RENDERDOC_MCP_TRACE", "0").lower() in (
+    "1",
+    "true",
+    "yes",
+    "on",
+)
+
+
 def _trace(msg):
+    if not _TRACE_ENABLED:
+        return
     try:
         d = os.path.join(tempfile.gettempdir(), "renderdoc_mcp")
         if not os.path.exists(d):
@@ -29,6 +39,8 @@ class CaptureManager:
             os.environ.get("RENDERDOC_MCP_ENABLE_OPEN_CAPTURE", "0").lower()
             in ("1", "true", "yes", "on")
         )
+        # (raw filename reported by the context, its normalized form)
+        self._loaded_norm_path = None
 
     def get_capture_status(self):
         """Check if a capture is loaded and get API info"""
@@ -70,27 +82,32 @@ class CaptureManager:
         if not os.path.isdir(directory):
             raise ValueError("Directory not found: %s" % directory)
 
-        captures = []
+        entries = []
 
         try:
-            for filename in os.listdir(directory):
-                if filename.lower().endswith(".rdc"):
-                    filepath = os.path.join(directory, filename)
-                    if os.path.isfile(filepath):
-                        stat = os.stat(filepath)
-                        # Format timestamp as ISO 8601
-                        mtime = datetime.datetime.fromtimestamp(stat.st_mtime)
-                        captures.append({
-                            "filename": filename,
-                            "path": filepath,
-                            "size_bytes": stat.st_size,
-                            "modified_time": mtime.isoformat(),
-                        })
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if not entry.name.lower().endswith(".rdc"):
+                        continue
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name, entry.path, stat.st_size))
         except Exception as e:
             raise ValueError("Failed to list directory: %s" % str(e))
 
         # Sort by modified time (newest first)
-        captures.sort(key=lambda x: x["modified_time"], reverse=True)
+        entries.sort(key=lambda x: x[0], reverse=True)
+
+        captures = []
+        for mtime, filename, filepath, size_bytes in entries:
+            captures.append({
+                "filename": filename,
+                "path": filepath,
+                "size_bytes": size_bytes,
+                # Format timestamp as ISO 8601
+                "modified_time": datetime.datetime.fromtimestamp(mtime).isoformat(),
+            })
 
         return {
             "directory": directory,
@@ -108,22 +125,22 @@ class CaptureManager:
         Returns:
             dict with success status and capture info
         """
-        _trace("open_capture called: %s" % capture_path)
+        # Validate extension (no filesystem access needed)
+        if not capture_path.lower().endswith(".rdc"):
+            raise ValueError("Invalid file type. Expected .rdc file: %s" % capture_path)
 
         # Validate file exists
         if not os.path.isfile(capture_path):
             raise ValueError("Capture file not found: %s" % capture_path)
 
-        # Validate extension
-        if not capture_path.lower().endswith(".rdc"):
-            raise ValueError("Invalid file type. Expected .rdc file: %s" % capture_path)
+        _trace("open_capture called: %s" % capture_path)
 
         # Fast path: if already loaded, avoid touching LoadCapture.
         try:
             if self.ctx.IsCaptureLoaded():
                 current = self.ctx.GetCaptureFilename()
                 if current:
-                    cur_norm = os.path.normcase(os.path.abspath(current))
+                    cur_norm = self._normalized_loaded_path(current)
                     req_norm = os.path.normcase(os.path.abspath(capture_path))
                     if cur_norm == req_norm:
                         return {
@@ -133,7 +150,7 @@ class CaptureManager:
                             "already_loaded": True,
                         }
         except Exception:
-            pass
+            self._loaded_norm_path = None
 
         # Guardrail: this RenderDoc fork can hang in LoadCapture via extension API.
         # Keep this opt-in so MCP cannot freeze qrenderdoc by default.
@@ -197,6 +214,7 @@ class CaptureManager:
         # Verify the capture was loaded
         if not self.ctx.IsCaptureLoaded():
             _trace("open_capture verify failed: IsCaptureLoaded() == False")
+            self._loaded_norm_path = None
             raise ValueError("Failed to load capture (unknown error)")
 
         # Get capture info
@@ -225,3 +243,12 @@ class CaptureManager:
 
         _trace("open_capture complete: %s" % capture_path)
         return result
+
+    def _normalized_loaded_path(self, current):
+        """Normalize the loaded capture path, reusing it while it is unchanged."""
+        cached = self._loaded_norm_path
+        if cached is not None and cached[0] == current:
+            return cached[1]
+        cur_norm = os.path.normcase(os.path.abspath(current))
+        self._loaded_norm_path = (current, cur_norm)
+        return cur_norm
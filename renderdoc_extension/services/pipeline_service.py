@@ -2,9 +2,240 @@
 Pipeline state service for RenderDoc.
 """
 
+import operator
+import os
+import sys
+from collections import OrderedDict
+
 import renderdoc as rd
 
-from ..utils import Parsers, Serializers, Helpers
+from ..utils import CaptureCache, Parsers, Serializers, Helpers
+
+
+_NULL_RESOURCE_ID = rd.ResourceId.Null()
+_EMPTY_NAME_MAPS = ({}, {}, {})
+_EMPTY_DETAILS = {}
+_SHADER_INFO_SECTIONS = ("disassembly", "constant_buffers", "resources")
+# Pipeline snapshots kept per capture for repeat/delta requests
+_PIPELINE_SNAPSHOT_LIMIT = 64
+# Serialized constant buffer contents kept per capture (LRU)
+_CBUFFER_CACHE_LIMIT = 512
+
+# Stage/API names are used as keys and values in every pipeline snapshot;
+# stringify them once instead of per event.
+_SHADER_STAGES = tuple(
+    (stage, sys.intern(str(stage))) for stage in Helpers.get_all_shader_stages()
+)
+_API_NAMES = {}
+
+
+def _api_name(api):
+    """Interned str(api), memoized per GraphicsAPI value"""
+    name = _API_NAMES.get(api)
+    if name is None:
+        name = _API_NAMES[api] = sys.intern(str(api))
+    return name
+
+
+# Bindings expose the bound resource as either .resource or .resourceId
+# depending on the struct and RenderDoc version; remember which one each
+# type has instead of probing both on every binding.
+_VIEW_RESOURCE_ATTRS = ("resource", "resourceId")
+_DESC_RESOURCE_ATTRS = ("resourceId", "resource")
+_RESOURCE_ATTR_BY_TYPE = {}
+
+
+def _resource_id_of(obj, attrs):
+    """Get the bound ResourceId of obj, trying attrs in preference order"""
+    key = (type(obj), attrs)
+    attr = _RESOURCE_ATTR_BY_TYPE.get(key)
+    if attr is not None:
+        try:
+            return getattr(obj, attr)
+        except AttributeError:
+            pass
+    for attr in attrs:
+        try:
+            res_id = getattr(obj, attr)
+        except AttributeError:
+            continue
+        _RESOURCE_ATTR_BY_TYPE[key] = attr
+        return res_id
+    return _NULL_RESOURCE_ID
+
+
+_D3D11_STAGE_ATTRS = (
+    ("vertex", "vertexShader"),
+    ("pixel", "pixelShader"),
+    ("geometry", "geometryShader"),
+    ("hull", "hullShader"),
+    ("domain", "domainShader"),
+    ("compute", "computeShader"),
+)
+_D3D11_STAGE_ATTRS_BY_TYPE = {}
+
+
+def _d3d11_stage_attrs(d3d11_state):
+    """Resolve (stage_name, attr_name) pairs for a D3D11 state type once"""
+    state_type = type(d3d11_state)
+    resolved = _D3D11_STAGE_ATTRS_BY_TYPE.get(state_type)
+    if resolved is None:
+        resolved = []
+        for stage_name, attr_name in _D3D11_STAGE_ATTRS:
+            if not hasattr(d3d11_state, attr_name):
+                # Alternate naming used by some RenderDoc forks.
+                attr_name = attr_name[:1].upper() + attr_name[1:]
+                if not hasattr(d3d11_state, attr_name):
+                    continue
+            resolved.append((stage_name, attr_name))
+        _D3D11_STAGE_ATTRS_BY_TYPE[state_type] = resolved
+    return resolved
+
+
+def _viewport_dicts(viewports):
+    """Serialize viewports; a dict literal per viewport is the cheapest
+    record here since the result goes straight to JSON."""
+    return [
+        {
+            "x": v.x,
+            "y": v.y,
+            "width": v.width,
+            "height": v.height,
+            "min_depth": v.minDepth,
+            "max_depth": v.maxDepth,
+        }
+        for v in viewports
+    ]
+
+
+# str() of a SWIG enum walks its metadata each time; the same handful of
+# fill/cull/blend/compare/address values repeat on every event. Keyed by
+# type as well, since values of different enums compare equal as ints.
+_ENUM_STR = {}
+
+
+def _enum_str(val):
+    """Memoized str() for int-backed enum values"""
+    if not isinstance(val, int):
+        # Only int enums hash by value; anything else would grow the table
+        return str(val)
+    key = (type(val), val)
+    text = _ENUM_STR.get(key)
+    if text is None:
+        text = _ENUM_STR[key] = str(val)
+    return text
+
+
+def _enum_to_str(val):
+    return _enum_str(val) if hasattr(val, "name") else val
+
+
+def _fields(spec, convert=None):
+    """Build (output key, attrgetter, convert) tuples.
+
+    spec items are attribute names, or (attribute, output key) pairs when
+    several spellings of one attribute map to the same key."""
+    fields = []
+    for item in spec:
+        attr, key = item if isinstance(item, tuple) else (item, item)
+        fields.append((key, operator.attrgetter(attr), convert))
+    return tuple(fields)
+
+
+def _extract_fields(obj, fields, out):
+    """Copy the non-None attributes described by fields from obj into out"""
+    for key, getter, convert in fields:
+        try:
+            val = getter(obj)
+        except AttributeError:
+            continue
+        if val is not None:
+            out[key] = convert(val) if convert is not None else val
+    return out
+
+
+_RT_VIEW_FIELDS = _fields(("firstMip", "firstSlice", "numMips", "numSlices"))
+# SRV/UAV descriptor subresource range, read in one call when all present
+_DESC_RANGE = operator.attrgetter("firstMip", "numMips", "firstSlice", "numSlices")
+_INDEX_BUFFER_FIELDS = _fields(
+    ("byteOffset", "offset", "byteStride", "indexByteStride")
+) + _fields(("format",), str)
+_VERTEX_BUFFER_FIELDS = _fields(
+    (
+        "byteOffset",
+        "offset",
+        "byteStride",
+        "stride",
+        "perInstance",
+        "instanceRate",
+        "instanceDataStepRate",
+    )
+)
+_LAYOUT_ELEMENT_FIELDS = (
+    _fields(("semanticName", "semanticIndex"))
+    + _fields(("format",), str)
+    + _fields(
+        (
+            "byteOffset",
+            "vertexBuffer",
+            "vertexBufferSlot",
+            "perInstance",
+            "instanceRate",
+            "instanceDataStepRate",
+        )
+    )
+)
+_CBUFFER_BIND_FIELDS = _fields(("byteOffset", "offset", "byteSize", "size"), int)
+_RASTERIZER_FIELDS = _fields(
+    (
+        "fillMode",
+        "cullMode",
+        "frontCCW",
+        "depthClamp",
+        "depthClip",
+        "scissorEnable",
+        ("ScissorEnable", "scissorEnable"),
+        ("scissorEnabled", "scissorEnable"),
+        "multisampleEnable",
+        "antialiasedLines",
+        "forcedSampleCount",
+    ),
+    _enum_to_str,
+)
+_DEPTH_STENCIL_FIELDS = _fields(
+    (
+        "depthEnable",
+        ("DepthEnable", "depthEnable"),
+        "depthWrites",
+        ("DepthWrites", "depthWrites"),
+        "depthFunction",
+        ("DepthFunction", "depthFunction"),
+        "depthBounds",
+        ("DepthBounds", "depthBounds"),
+        "stencilEnable",
+        ("StencilEnable", "stencilEnable"),
+        "stencilReadMask",
+        ("StencilReadMask", "stencilReadMask"),
+        "stencilWriteMask",
+        ("StencilWriteMask", "stencilWriteMask"),
+    ),
+    _enum_to_str,
+)
+_BLEND_TARGET_FIELDS = _fields(
+    (
+        "enabled",
+        "logicEnabled",
+        "logic",
+        "writeMask",
+        "source",
+        "destination",
+        "operation",
+        "alphaSource",
+        "alphaDestination",
+        "alphaOperation",
+    ),
+    _enum_to_str,
+)
 
 
 class PipelineService:
@@ -13,12 +244,36 @@ class PipelineService:
     def __init__(self, ctx, invoke_fn):
         self.ctx = ctx
         self._invoke = invoke_fn
-
-    def get_shader_info(self, event_id, stage):
-        """Get shader information for a specific stage"""
+        self._cache = CaptureCache(ctx)
+        # dir()-based introspection of D3D11 state objects, for diagnosing
+        # RenderDoc builds with unexpected attribute names.
+        self._debug = (
+            os.environ.get("RENDERDOC_MCP_PIPELINE_DEBUG", "0").lower()
+            in ("1", "true", "yes", "on")
+        )
+
+    def invalidate_caches(self):
+        """Drop capture-scoped caches (called after a capture is loaded)."""
+        self._cache.clear()
+
+    def get_shader_info(self, event_id, stage, sections=None):
+        """Get shader information for a specific stage.
+
+        sections limits the output to a subset of "disassembly",
+        "constant_buffers" and "resources" (default: all)."""
         if not self.ctx.IsCaptureLoaded():
             raise ValueError("No capture loaded")
 
+        if sections is None:
+            sections = _SHADER_INFO_SECTIONS
+        else:
+            unknown = [s for s in sections if s not in _SHADER_INFO_SECTIONS]
+            if unknown:
+                raise ValueError(
+                    "Unknown shader info section(s): %s (expected any of: %s)"
+                    % (", ".join(map(str, unknown)), ", ".join(_SHADER_INFO_SECTIONS))
+                )
+
         result = {"shader": None, "error": None}
 
         def callback(controller):
@@ -28,7 +283,7 @@ class PipelineService:
             stage_enum = Parsers.parse_stage(stage)
 
             shader = pipe.GetShader(stage_enum)
-            if shader == rd.ResourceId.Null():
+            if shader == _NULL_RESOURCE_ID:
                 result["error"] = "No %s shader bound" % stage
                 return
 
@@ -42,22 +297,25 @@ class PipelineService:
             }
 
             # Get disassembly
-            try:
-                targets = controller.GetDisassemblyTargets(True)
-                if targets:
-                    disasm = controller.DisassembleShader(
-                        pipe.GetGraphicsPipelineObject(), reflection, targets[0]
-                    )
-                    shader_info["disassembly"] = disasm
-            except Exception as e:
-                shader_info["disassembly_error"] = str(e)
+            if "disassembly" in sections:
+                try:
+                    targets = controller.GetDisassemblyTargets(True)
+                    if targets:
+                        disasm = controller.DisassembleShader(
+                            pipe.GetGraphicsPipelineObject(), reflection, targets[0]
+                        )
+                        shader_info["disassembly"] = disasm
+                except Exception as e:
+                    shader_info["disassembly_error"] = str(e)
 
             # Get constant buffer info
             if reflection:
-                shader_info["constant_buffers"] = self._get_cbuffer_info(
-                    controller, pipe, reflection, stage_enum
-                )
-                shader_info["resources"] = self._get_resource_bindings(reflection)
+                if "constant_buffers" in sections:
+                    shader_info["constant_buffers"] = self._get_cbuffer_info(
+                        controller, pipe, reflection, stage_enum, event_id
+                    )
+                if "resources" in sections:
+                    shader_info["resources"] = self._get_resource_bindings(reflection)
 
             result["shader"] = shader_info
 
@@ -67,81 +325,125 @@ class PipelineService:
             raise ValueError(result["error"])
         return result["shader"]
 
-    def get_pipeline_state(self, event_id):
-        """Get full pipeline state at an event"""
+    def get_pipeline_state(self, event_id, base_event_id=None):
+        """Get full pipeline state at an event.
+
+        With base_event_id, only the top-level sections that differ from the
+        pipeline state at base_event_id are returned (see _diff_pipeline_states).
+        """
         if not self.ctx.IsCaptureLoaded():
             raise ValueError("No capture loaded")
 
+        pipeline_info = self._get_pipeline_snapshot(event_id)
+        if base_event_id is None or base_event_id == event_id:
+            # The snapshot is shared with the cache; callers get their own dict
+            return dict(pipeline_info)
+        base_info = self._get_pipeline_snapshot(base_event_id)
+        return self._diff_pipeline_states(pipeline_info, base_info, base_event_id)
+
+    @staticmethod
+    def _diff_pipeline_states(pipeline_info, base_info, base_event_id):
+        """Reduce pipeline_info to the sections that changed since base_info"""
+        delta = {
+            "event_id": pipeline_info["event_id"],
+            "api": pipeline_info["api"],
+            "base_event_id": base_event_id,
+            "changed": {},
+            "removed": [],
+            "unchanged": [],
+        }
+        for key, value in pipeline_info.items():
+            if key in ("event_id", "api"):
+                continue
+            if key in base_info and base_info[key] == value:
+                delta["unchanged"].append(key)
+            else:
+                delta["changed"][key] = value
+        for key in base_info:
+            if key not in pipeline_info:
+                delta["removed"].append(key)
+        return delta
+
+    def _get_pipeline_snapshot(self, event_id):
+        """Get the pipeline state dict at an event, reusing recent snapshots.
+
+        The returned dict is shared with the cache and must not be mutated."""
         result = {"pipeline": None, "error": None}
 
         def callback(controller):
+            snapshots = self._cache.get("pipeline_snapshots", OrderedDict)
+            cached = snapshots.get(event_id)
+            if cached is not None:
+                snapshots.move_to_end(event_id)
+                result["pipeline"] = cached
+                return
+
             controller.SetFrameEvent(event_id, True)
 
             pipe = controller.GetPipelineState()
             api = controller.GetAPIProperties().pipelineType
 
-            # Build lookup maps once for O(1) resource lookups
-            tex_map, buf_map = self._build_resource_maps(controller)
+            # Lookup maps for O(1) resource lookups, built once per capture
+            res_details, tex_meta = self._get_resource_maps(controller)
 
             pipeline_info = {
                 "event_id": event_id,
-                "api": str(api),
+                "api": _api_name(api),
             }
 
-            # Shader stages with detailed bindings
-            stages = {}
-            stage_list = Helpers.get_all_shader_stages()
-            for stage in stage_list:
+            # Shader stages with detailed bindings. Probe which stages are
+            # bound first so the per-stage getters only run for those.
+            bound_stages = []
+            for stage, stage_name in _SHADER_STAGES:
                 shader = pipe.GetShader(stage)
-                if shader != rd.ResourceId.Null():
-                    stage_info = {
-                        "resource_id": str(shader),
-                        "entry_point": pipe.GetShaderEntryPoint(stage),
-                    }
+                if shader != _NULL_RESOURCE_ID:
+                    bound_stages.append((stage, stage_name, shader))
 
-                    reflection = pipe.GetShaderReflection(stage)
+            stages = {}
+            for stage, stage_name, shader in bound_stages:
+                stage_info = {
+                    "resource_id": str(shader),
+                    "entry_point": pipe.GetShaderEntryPoint(stage),
+                }
 
-                    stage_info["resources"] = self._get_stage_resources(
-                        pipe, stage, reflection, tex_map, buf_map
-                    )
-                    stage_info["uavs"] = self._get_stage_uavs(
-                        pipe, stage, reflection, tex_map, buf_map
-                    )
-                    stage_info["samplers"] = self._get_stage_samplers(
-                        pipe, stage, reflection
-                    )
-                    stage_info["constant_buffers"] = self._get_stage_cbuffers(
-                        controller, pipe, stage, reflection
+                reflection = pipe.GetShaderReflection(stage)
+                try:
+                    srv_names, uav_names, sampler_names = (
+                        self._reflection_name_maps(reflection)
                     )
+                except Exception:
+                    srv_names, uav_names, sampler_names = _EMPTY_NAME_MAPS
 
-                    stages[str(stage)] = stage_info
+                stage_info["resources"] = self._get_stage_resources(
+                    pipe, stage, srv_names, res_details
+                )
+                stage_info["uavs"] = self._get_stage_uavs(
+                    pipe, stage, uav_names, res_details
+                )
+                stage_info["samplers"] = self._get_stage_samplers(
+                    pipe, stage, sampler_names
+                )
+                stage_info["constant_buffers"] = self._get_stage_cbuffers(
+                    controller, pipe, stage, reflection
+                )
+
+                stages[stage_name] = stage_info
 
             pipeline_info["shaders"] = stages
 
-            # Try D3D11-specific state access
+            # D3D11-specific state access; other APIs would only return None
             d3d11_state = None
-            try:
-                d3d11_state = controller.GetD3D11PipelineState()
-            except Exception:
-                pass
+            if api == rd.GraphicsAPI.D3D11:
+                try:
+                    d3d11_state = controller.GetD3D11PipelineState()
+                except Exception:
+                    pass
 
             # Viewport and scissor
             try:
                 vp_scissor = pipe.GetViewportScissor()
                 if vp_scissor:
-                    viewports = []
-                    for v in vp_scissor.viewports:
-                        viewports.append(
-                            {
-                                "x": v.x,
-                                "y": v.y,
-                                "width": v.width,
-                                "height": v.height,
-                                "min_depth": v.minDepth,
-                                "max_depth": v.maxDepth,
-                            }
-                        )
-                    pipeline_info["viewports"] = viewports
+                    pipeline_info["viewports"] = _viewport_dicts(vp_scissor.viewports)
             except Exception as e:
                 pipeline_info["viewports_error"] = str(e)
 
@@ -152,9 +454,13 @@ class PipelineService:
                     if om:
                         rts = []
                         for i, rt in enumerate(om.renderTargets):
-                            res_id = getattr(rt, 'resource', getattr(rt, 'resourceId', rd.ResourceId.Null()))
-                            if res_id != rd.ResourceId.Null():
-                                rt_info = {"index": i, "resource_id": str(res_id)}
+                            res_id = _resource_id_of(rt, _VIEW_RESOURCE_ATTRS)
+                            if res_id != _NULL_RESOURCE_ID:
+                                res_key = Parsers.resource_key(res_id)
+                                rt_info = {
+                                    "index": i,
+                                    "resource_id": Parsers.resource_id_str(res_key),
+                                }
                                 # Get RTV view format
                                 try:
                                     fmt = rt.format
@@ -163,23 +469,21 @@ class PipelineService:
                                 except Exception:
                                     pass
                                 # Get slice/mip info
-                                for attr in ['firstMip', 'firstSlice', 'numMips', 'numSlices']:
-                                    val = getattr(rt, attr, None)
-                                    if val is not None:
-                                        rt_info[attr] = val
+                                _extract_fields(rt, _RT_VIEW_FIELDS, rt_info)
                                 # Get texture info
-                                tex = tex_map.get(str(res_id))
-                                if tex is not None:
-                                    rt_info["texture_format"] = str(tex.format.Name())
-                                    rt_info["width"] = tex.width
-                                    rt_info["height"] = tex.height
+                                meta = tex_meta.get(res_key)
+                                if meta is not None:
+                                    fmt_name, width, height = meta
+                                    rt_info["texture_format"] = fmt_name
+                                    rt_info["width"] = width
+                                    rt_info["height"] = height
                                 rts.append(rt_info)
                         pipeline_info["render_targets"] = rts
 
                         try:
                             ds = om.depthTarget
-                            depth_id = getattr(ds, 'resource', getattr(ds, 'resourceId', rd.ResourceId.Null()))
-                            if depth_id != rd.ResourceId.Null():
+                            depth_id = _resource_id_of(ds, _VIEW_RESOURCE_ATTRS)
+                            if depth_id != _NULL_RESOURCE_ID:
                                 pipeline_info["depth_target"] = str(depth_id)
                         except Exception:
                             pass
@@ -189,14 +493,19 @@ class PipelineService:
                     if om:
                         rts = []
                         for i, rt in enumerate(om.renderTargets):
-                            res_id = getattr(rt, 'resource', getattr(rt, 'resourceId', rd.ResourceId.Null()))
-                            if res_id != rd.ResourceId.Null():
-                                rt_info = {"index": i, "resource_id": str(res_id)}
-                                tex = tex_map.get(str(res_id))
-                                if tex is not None:
-                                    rt_info["format"] = str(tex.format.Name())
-                                    rt_info["width"] = tex.width
-                                    rt_info["height"] = tex.height
+                            res_id = _resource_id_of(rt, _VIEW_RESOURCE_ATTRS)
+                            if res_id != _NULL_RESOURCE_ID:
+                                res_key = Parsers.resource_key(res_id)
+                                rt_info = {
+                                    "index": i,
+                                    "resource_id": Parsers.resource_id_str(res_key),
+                                }
+                                meta = tex_meta.get(res_key)
+                                if meta is not None:
+                                    fmt_name, width, height = meta
+                                    rt_info["format"] = fmt_name
+                                    rt_info["width"] = width
+                                    rt_info["height"] = height
                                 rts.append(rt_info)
                         pipeline_info["render_targets"] = rts
             except Exception as e:
@@ -214,24 +523,11 @@ class PipelineService:
                             idx = getattr(ia, "indexBuffer", None)
                             if idx is not None:
                                 idx_desc = getattr(idx, "descriptor", idx)
-                                idx_res = getattr(
-                                    idx_desc,
-                                    "resourceId",
-                                    getattr(idx_desc, "resource", rd.ResourceId.Null()),
-                                )
+                                idx_res = _resource_id_of(idx_desc, _DESC_RESOURCE_ATTRS)
                                 idx_info = {}
-                                if idx_res != rd.ResourceId.Null():
+                                if idx_res != _NULL_RESOURCE_ID:
                                     idx_info["resource_id"] = str(idx_res)
-                                for attr in [
-                                    "byteOffset",
-                                    "offset",
-                                    "byteStride",
-                                    "indexByteStride",
-                                    "format",
-                                ]:
-                                    val = getattr(idx_desc, attr, None)
-                                    if val is not None:
-                                        idx_info[attr] = str(val) if attr == "format" else val
+                                _extract_fields(idx_desc, _INDEX_BUFFER_FIELDS, idx_info)
                                 if idx_info:
                                     ia_info["index_buffer"] = idx_info
                         except Exception as e:
@@ -243,25 +539,10 @@ class PipelineService:
                             for slot, vb in enumerate(getattr(ia, "vertexBuffers", [])):
                                 vb_desc = getattr(vb, "descriptor", vb)
                                 vb_info = {"slot": slot}
-                                vb_res = getattr(
-                                    vb_desc,
-                                    "resourceId",
-                                    getattr(vb_desc, "resource", rd.ResourceId.Null()),
-                                )
-                                if vb_res != rd.ResourceId.Null():
+                                vb_res = _resource_id_of(vb_desc, _DESC_RESOURCE_ATTRS)
+                                if vb_res != _NULL_RESOURCE_ID:
                                     vb_info["resource_id"] = str(vb_res)
-                                for attr in [
-                                    "byteOffset",
-                                    "offset",
-                                    "byteStride",
-                                    "stride",
-                                    "perInstance",
-                                    "instanceRate",
-                                    "instanceDataStepRate",
-                                ]:
-                                    val = getattr(vb_desc, attr, None)
-                                    if val is not None:
-                                        vb_info[attr] = val
+                                _extract_fields(vb_desc, _VERTEX_BUFFER_FIELDS, vb_info)
                                 vb_entries.append(vb_info)
                             ia_info["vertex_buffers"] = vb_entries
                         except Exception as e:
@@ -269,25 +550,14 @@ class PipelineService:
 
                         # Input layout elements (if exposed by current RenderDoc build)
                         try:
-                            elems = []
-                            for elem in getattr(ia, "layouts", []):
-                                entry = {}
-                                for attr in [
-                                    "semanticName",
-                                    "semanticIndex",
-                                    "format",
-                                    "byteOffset",
-                                    "vertexBuffer",
-                                    "vertexBufferSlot",
-                                    "perInstance",
-                                    "instanceRate",
-                                    "instanceDataStepRate",
-                                ]:
-                                    val = getattr(elem, attr, None)
-                                    if val is not None:
-                                        entry[attr] = str(val) if attr == "format" else val
-                                if entry:
-                                    elems.append(entry)
+                            elems = [
+                                entry
+                                for entry in (
+                                    _extract_fields(elem, _LAYOUT_ELEMENT_FIELDS, {})
+                                    for elem in getattr(ia, "layouts", [])
+                                )
+                                if entry
+                            ]
                             if elems:
                                 ia_info["layout_elements"] = elems
                         except Exception as e:
@@ -306,269 +576,215 @@ class PipelineService:
                 try:
                     rs = d3d11_state.rasterizer
                     if rs:
-                        viewports = []
-                        for v in rs.viewports:
-                            viewports.append({
-                                "x": v.x, "y": v.y,
-                                "width": v.width, "height": v.height,
-                                "min_depth": v.minDepth, "max_depth": v.maxDepth,
-                            })
-                        pipeline_info["viewports"] = viewports
+                        pipeline_info["viewports"] = _viewport_dicts(rs.viewports)
                 except Exception:
                     pass
 
-            # D3D11 fixed-function state details (rasterizer / OM)
+            # D3D11 fixed-function state details (rasterizer / OM). Each
+            # extractor records its own *_error key instead of raising.
             if d3d11_state:
-                try:
-                    pipeline_info["_debug_d3d11_attrs"] = [
-                        name for name in dir(d3d11_state) if "shader" in name.lower() or "input" in name.lower() or "output" in name.lower() or "raster" in name.lower()
-                    ]
-                    pipeline_info["_debug_d3d11_attr_types"] = {
-                        name: type(getattr(d3d11_state, name)).__name__
-                        for name in pipeline_info["_debug_d3d11_attrs"]
-                    }
-                except Exception:
-                    pass
-                try:
-                    stage_bindings = {}
-                    stage_attrs = [
-                        ("vertex", "vertexShader"),
-                        ("pixel", "pixelShader"),
-                        ("geometry", "geometryShader"),
-                        ("hull", "hullShader"),
-                        ("domain", "domainShader"),
-                        ("compute", "computeShader"),
-                    ]
-                    for stage_name, attr_name in stage_attrs:
-                        stage_obj = getattr(d3d11_state, attr_name, None)
-                        if not stage_obj:
-                            # Try alternate naming used by some RenderDoc forks.
-                            alt = attr_name[:1].upper() + attr_name[1:]
-                            stage_obj = getattr(d3d11_state, alt, None)
-                        if stage_obj:
-                            try:
-                                pipeline_info["_debug_stage_attrs_%s" % stage_name] = list(dir(stage_obj))
-                            except Exception:
-                                pass
-                        if not stage_obj:
-                            continue
-                        cb_list = []
-                        for slot, cb in enumerate(getattr(stage_obj, "constantBuffers", [])):
-                            cb_desc = getattr(cb, "descriptor", cb)
-                            res_id = getattr(
-                                cb_desc,
-                                "resourceId",
-                                getattr(cb_desc, "resource", rd.ResourceId.Null()),
-                            )
-                            entry = {"slot": slot}
-                            if res_id != rd.ResourceId.Null():
-                                entry["resource_id"] = str(res_id)
-                            for cb_attr in ["byteOffset", "offset", "byteSize", "size"]:
-                                val = getattr(cb_desc, cb_attr, None)
-                                if val is not None:
-                                    entry[cb_attr] = int(val)
-                            cb_list.append(entry)
-                        if cb_list:
-                            stage_bindings[stage_name] = cb_list
-                    if stage_bindings:
-                        pipeline_info["d3d11_constant_buffer_bindings"] = stage_bindings
-                except Exception as e:
-                    pipeline_info["d3d11_constant_buffer_bindings_error"] = str(e)
+                if self._debug:
+                    self._extract_d3d11_debug_attrs(d3d11_state, pipeline_info)
+                for extract in (
+                    self._extract_d3d11_cbuffers,
+                    self._extract_d3d11_rasterizer,
+                    self._extract_d3d11_output_merger,
+                ):
+                    extract(d3d11_state, pipeline_info)
 
-                try:
-                    rs = d3d11_state.rasterizer
-                    if rs:
-                        rs_info = {}
-                        for attr in [
-                            "fillMode",
-                            "cullMode",
-                            "frontCCW",
-                            "depthClamp",
-                            "depthClip",
-                            "scissorEnable",
-                            "ScissorEnable",
-                            "scissorEnabled",
-                            "multisampleEnable",
-                            "antialiasedLines",
-                            "forcedSampleCount",
-                        ]:
-                            val = getattr(rs, attr, None)
-                            if val is not None:
-                                key = attr
-                                if attr in ("ScissorEnable", "scissorEnabled"):
-                                    key = "scissorEnable"
-                                rs_info[key] = str(val) if hasattr(val, "name") else val
+            result["pipeline"] = pipeline_info
+            snapshots[event_id] = pipeline_info
+            if len(snapshots) > _PIPELINE_SNAPSHOT_LIMIT:
+                snapshots.popitem(last=False)
 
-                        try:
-                            scissors = []
-                            for s in getattr(rs, "scissors", []):
-                                x = int(getattr(s, "x", getattr(s, "left", 0)))
-                                y = int(getattr(s, "y", getattr(s, "top", 0)))
-                                w = int(getattr(s, "w", 0))
-                                h = int(getattr(s, "h", 0))
-                                right = int(getattr(s, "right", x + w))
-                                bottom = int(getattr(s, "bottom", y + h))
-                                scissors.append(
-                                    {
-                                        "left": x,
-                                        "top": y,
-                                        "right": right,
-                                        "bottom": bottom,
-                                    }
-                                )
-                            if scissors:
-                                rs_info["scissors"] = scissors
-                        except Exception as e:
-                            rs_info["scissors_error"] = str(e)
+        self._invoke(callback)
 
-                        try:
-                            rs_info["_debug_attrs"] = [
-                                name
-                                for name in dir(rs)
-                                if ("scissor" in name.lower() or "depth" in name.lower())
-                            ]
-                        except Exception:
-                            pass
+        if result["error"]:
+            raise ValueError(result["error"])
+        return result["pipeline"]
 
-                        if rs_info:
-                            pipeline_info["rasterizer_state"] = rs_info
-                except Exception as e:
-                    pipeline_info["rasterizer_state_error"] = str(e)
+    def _extract_d3d11_debug_attrs(self, d3d11_state, pipeline_info):
+        """dir()-based D3D11 state introspection (RENDERDOC_MCP_PIPELINE_DEBUG)"""
+        try:
+            pipeline_info["_debug_d3d11_attrs"] = [
+                name for name in dir(d3d11_state) if "shader" in name.lower() or "input" in name.lower() or "output" in name.lower() or "raster" in name.lower()
+            ]
+            pipeline_info["_debug_d3d11_attr_types"] = {
+                name: type(getattr(d3d11_state, name)).__name__
+                for name in pipeline_info["_debug_d3d11_attrs"]
+            }
+        except Exception:
+            pass
 
-                try:
-                    om = d3d11_state.outputMerger
-                    if om:
-                        om_info = {}
+    def _extract_d3d11_cbuffers(self, d3d11_state, pipeline_info):
+        """D3D11 per-stage constant buffer bindings"""
+        try:
+            stage_bindings = {}
+            for stage_name, attr_name in _d3d11_stage_attrs(d3d11_state):
+                stage_obj = getattr(d3d11_state, attr_name, None)
+                if stage_obj and self._debug:
+                    try:
+                        pipeline_info["_debug_stage_attrs_%s" % stage_name] = list(dir(stage_obj))
+                    except Exception:
+                        pass
+                if not stage_obj:
+                    continue
+                cb_list = []
+                for slot, cb in enumerate(getattr(stage_obj, "constantBuffers", [])):
+                    cb_desc = getattr(cb, "descriptor", cb)
+                    res_id = _resource_id_of(cb_desc, _DESC_RESOURCE_ATTRS)
+                    entry = {"slot": slot}
+                    if res_id != _NULL_RESOURCE_ID:
+                        entry["resource_id"] = str(res_id)
+                    _extract_fields(cb_desc, _CBUFFER_BIND_FIELDS, entry)
+                    cb_list.append(entry)
+                if cb_list:
+                    stage_bindings[stage_name] = cb_list
+            if stage_bindings:
+                pipeline_info["d3d11_constant_buffer_bindings"] = stage_bindings
+        except Exception as e:
+            pipeline_info["d3d11_constant_buffer_bindings_error"] = str(e)
 
-                        try:
-                            ds = getattr(om, "depthState", None)
-                            if ds is None:
-                                ds = getattr(om, "DepthState", None)
-                            if ds is not None:
-                                ds_info = {}
-                                for attr in [
-                                    "depthEnable",
-                                    "DepthEnable",
-                                    "depthWrites",
-                                    "DepthWrites",
-                                    "depthFunction",
-                                    "DepthFunction",
-                                    "depthBounds",
-                                    "DepthBounds",
-                                    "stencilEnable",
-                                    "StencilEnable",
-                                    "stencilReadMask",
-                                    "StencilReadMask",
-                                    "stencilWriteMask",
-                                    "StencilWriteMask",
-                                ]:
-                                    val = getattr(ds, attr, None)
-                                    if val is not None:
-                                        key = attr[0].lower() + attr[1:] if attr[:1].isupper() else attr
-                                        ds_info[key] = str(val) if hasattr(val, "name") else val
-                                try:
-                                    ds_info["_debug_attrs"] = [
-                                        name
-                                        for name in dir(ds)
-                                        if ("depth" in name.lower() or "stencil" in name.lower())
-                                    ]
-                                except Exception:
-                                    pass
-                                if ds_info:
-                                    om_info["depth_stencil_state"] = ds_info
-                        except Exception as e:
-                            om_info["depth_stencil_state_error"] = str(e)
+    def _extract_d3d11_rasterizer(self, d3d11_state, pipeline_info):
+        """D3D11 rasterizer state and scissors"""
+        try:
+            rs = d3d11_state.rasterizer
+            if rs:
+                rs_info = _extract_fields(rs, _RASTERIZER_FIELDS, {})
 
-                        try:
-                            bs = getattr(om, "blendState", None)
-                            if bs is not None:
-                                bs_info = {}
-                                alpha_to_cov = getattr(bs, "alphaToCoverage", None)
-                                if alpha_to_cov is not None:
-                                    bs_info["alphaToCoverage"] = alpha_to_cov
-                                indep = getattr(bs, "independentBlend", None)
-                                if indep is not None:
-                                    bs_info["independentBlend"] = indep
-
-                                targets = []
-                                for i, bt in enumerate(getattr(bs, "blends", [])):
-                                    t = {"index": i}
-                                    for attr in [
-                                        "enabled",
-                                        "logicEnabled",
-                                        "logic",
-                                        "writeMask",
-                                        "source",
-                                        "destination",
-                                        "operation",
-                                        "alphaSource",
-                                        "alphaDestination",
-                                        "alphaOperation",
-                                    ]:
-                                        val = getattr(bt, attr, None)
-                                        if val is not None:
-                                            t[attr] = str(val) if hasattr(val, "name") else val
-                                    targets.append(t)
-                                if targets:
-                                    bs_info["targets"] = targets
-                                if bs_info:
-                                    om_info["blend_state"] = bs_info
-                        except Exception as e:
-                            om_info["blend_state_error"] = str(e)
+                try:
+                    scissors = []
+                    for s in getattr(rs, "scissors", []):
+                        x = int(getattr(s, "x", getattr(s, "left", 0)))
+                        y = int(getattr(s, "y", getattr(s, "top", 0)))
+                        w = int(getattr(s, "w", 0))
+                        h = int(getattr(s, "h", 0))
+                        right = int(getattr(s, "right", x + w))
+                        bottom = int(getattr(s, "bottom", y + h))
+                        scissors.append(
+                            {
+                                "left": x,
+                                "top": y,
+                                "right": right,
+                                "bottom": bottom,
+                            }
+                        )
+                    if scissors:
+                        rs_info["scissors"] = scissors
+                except Exception as e:
+                    rs_info["scissors_error"] = str(e)
+
+                if self._debug:
+                    try:
+                        rs_info["_debug_attrs"] = [
+                            name
+                            for name in dir(rs)
+                            if ("scissor" in name.lower() or "depth" in name.lower())
+                        ]
+                    except Exception:
+                        pass
+
+                if rs_info:
+                    pipeline_info["rasterizer_state"] = rs_info
+        except Exception as e:
+            pipeline_info["rasterizer_state_error"] = str(e)
 
-                        try:
-                            sample_mask = getattr(om, "sampleMask", None)
-                            if sample_mask is not None:
-                                om_info["sample_mask"] = int(sample_mask)
-                        except Exception:
-                            pass
+    def _extract_d3d11_output_merger(self, d3d11_state, pipeline_info):
+        """D3D11 depth-stencil, blend and sample mask state"""
+        try:
+            om = d3d11_state.outputMerger
+            if om:
+                om_info = {}
 
-                        if om_info:
-                            pipeline_info["output_merger_state"] = om_info
+                try:
+                    ds = getattr(om, "depthState", None)
+                    if ds is None:
+                        ds = getattr(om, "DepthState", None)
+                    if ds is not None:
+                        ds_info = _extract_fields(ds, _DEPTH_STENCIL_FIELDS, {})
+                        if self._debug:
+                            try:
+                                ds_info["_debug_attrs"] = [
+                                    name
+                                    for name in dir(ds)
+                                    if ("depth" in name.lower() or "stencil" in name.lower())
+                                ]
+                            except Exception:
+                                pass
+                        if ds_info:
+                            om_info["depth_stencil_state"] = ds_info
                 except Exception as e:
-                    pipeline_info["output_merger_state_error"] = str(e)
+                    om_info["depth_stencil_state_error"] = str(e)
 
-            result["pipeline"] = pipeline_info
+                try:
+                    bs = getattr(om, "blendState", None)
+                    if bs is not None:
+                        bs_info = {}
+                        alpha_to_cov = getattr(bs, "alphaToCoverage", None)
+                        if alpha_to_cov is not None:
+                            bs_info["alphaToCoverage"] = alpha_to_cov
+                        indep = getattr(bs, "independentBlend", None)
+                        if indep is not None:
+                            bs_info["independentBlend"] = indep
+
+                        targets = [
+                            _extract_fields(bt, _BLEND_TARGET_FIELDS, {"index": i})
+                            for i, bt in enumerate(getattr(bs, "blends", []))
+                        ]
+                        if targets:
+                            bs_info["targets"] = targets
+                        if bs_info:
+                            om_info["blend_state"] = bs_info
+                except Exception as e:
+                    om_info["blend_state_error"] = str(e)
 
-        self._invoke(callback)
+                try:
+                    sample_mask = getattr(om, "sampleMask", None)
+                    if sample_mask is not None:
+                        om_info["sample_mask"] = int(sample_mask)
+                except Exception:
+                    pass
 
-        if result["error"]:
-            raise ValueError(result["error"])
-        return result["pipeline"]
+                if om_info:
+                    pipeline_info["output_merger_state"] = om_info
+        except Exception as e:
+            pipeline_info["output_merger_state_error"] = str(e)
 
-    def _get_stage_resources(self, pipe, stage, reflection, tex_map, buf_map):
+    def _get_stage_resources(self, pipe, stage, name_map, res_details):
         """Get shader resource views (SRVs) for a stage"""
         resources = []
         try:
             srvs = pipe.GetReadOnlyResources(stage, False)
 
-            name_map = {}
-            if reflection:
-                for res in reflection.readOnlyResources:
-                    bind = getattr(res, 'fixedBindNumber', getattr(res, 'bindPoint', -1))
-                    name_map[bind] = res.name
-
             for srv in srvs:
                 desc = srv.descriptor
-                res_id = getattr(desc, 'resource', rd.ResourceId.Null())
-                if res_id == rd.ResourceId.Null():
+                res_id = getattr(desc, 'resource', _NULL_RESOURCE_ID)
+                if res_id == _NULL_RESOURCE_ID:
                     continue
+                res_key = Parsers.resource_key(res_id)
 
                 slot = srv.access.index
                 res_info = {
                     "slot": slot,
                     "name": name_map.get(slot, ""),
-                    "resource_id": str(res_id),
+                    "resource_id": Parsers.resource_id_str(res_key),
                 }
 
                 res_info.update(
-                    self._get_resource_details(res_id, tex_map, buf_map)
+                    self._get_resource_details(res_id, res_key, res_details)
                 )
 
-                res_info["first_mip"] = getattr(desc, 'firstMip', 0)
-                res_info["num_mips"] = getattr(desc, 'numMips', 1)
-                res_info["first_slice"] = getattr(desc, 'firstSlice', 0)
-                res_info["num_slices"] = getattr(desc, 'numSlices', 1)
+                try:
+                    first_mip, num_mips, first_slice, num_slices = _DESC_RANGE(desc)
+                except AttributeError:
+                    first_mip = getattr(desc, 'firstMip', 0)
+                    num_mips = getattr(desc, 'numMips', 1)
+                    first_slice = getattr(desc, 'firstSlice', 0)
+                    num_slices = getattr(desc, 'numSlices', 1)
+                res_info["first_mip"] = first_mip
+                res_info["num_mips"] = num_mips
+                res_info["first_slice"] = first_slice
+                res_info["num_slices"] = num_slices
 
                 resources.append(res_info)
         except Exception as e:
@@ -576,37 +792,38 @@ class PipelineService:
 
         return resources
 
-    def _get_stage_uavs(self, pipe, stage, reflection, tex_map, buf_map):
+    def _get_stage_uavs(self, pipe, stage, name_map, res_details):
         """Get unordered access views (UAVs) for a stage"""
         uavs = []
         try:
             uav_list = pipe.GetReadWriteResources(stage, False)
 
-            name_map = {}
-            if reflection:
-                for res in reflection.readWriteResources:
-                    bind = getattr(res, 'fixedBindNumber', getattr(res, 'bindPoint', -1))
-                    name_map[bind] = res.name
-
             for uav in uav_list:
                 desc = uav.descriptor
-                res_id = getattr(desc, 'resource', rd.ResourceId.Null())
-                if res_id == rd.ResourceId.Null():
+                res_id = getattr(desc, 'resource', _NULL_RESOURCE_ID)
+                if res_id == _NULL_RESOURCE_ID:
                     continue
+                res_key = Parsers.resource_key(res_id)
 
                 slot = uav.access.index
                 uav_info = {
                     "slot": slot,
                     "name": name_map.get(slot, ""),
-                    "resource_id": str(res_id),
+                    "resource_id": Parsers.resource_id_str(res_key),
                 }
 
                 uav_info.update(
-                    self._get_resource_details(res_id, tex_map, buf_map)
+                    self._get_resource_details(res_id, res_key, res_details)
                 )
 
-                uav_info["first_element"] = getattr(desc, 'firstMip', 0)
-                uav_info["num_elements"] = getattr(desc, 'numMips', 0)
+                try:
+                    uav_info["first_element"] = desc.firstMip
+                except AttributeError:
+                    uav_info["first_element"] = 0
+                try:
+                    uav_info["num_elements"] = desc.numMips
+                except AttributeError:
+                    uav_info["num_elements"] = 0
 
                 uavs.append(uav_info)
         except Exception as e:
@@ -614,17 +831,12 @@ class PipelineService:
 
         return uavs
 
-    def _get_stage_samplers(self, pipe, stage, reflection):
+    def _get_stage_samplers(self, pipe, stage, name_map):
         """Get samplers for a stage"""
         samplers = []
         try:
             sampler_list = pipe.GetSamplers(stage, False)
 
-            name_map = {}
-            if reflection:
-                for samp in reflection.samplers:
-                    name_map[samp.fixedBindNumber] = samp.name
-
             for samp in sampler_list:
                 slot = samp.access.index
                 samp_info = {
@@ -634,9 +846,9 @@ class PipelineService:
 
                 desc = samp.descriptor
                 try:
-                    samp_info["address_u"] = str(desc.addressU)
-                    samp_info["address_v"] = str(desc.addressV)
-                    samp_info["address_w"] = str(desc.addressW)
+                    samp_info["address_u"] = _enum_str(desc.addressU)
+                    samp_info["address_v"] = _enum_str(desc.addressV)
+                    samp_info["address_w"] = _enum_str(desc.addressW)
                 except AttributeError:
                     pass
 
@@ -668,7 +880,7 @@ class PipelineService:
                     pass
 
                 try:
-                    samp_info["compare_function"] = str(desc.compareFunction)
+                    samp_info["compare_function"] = _enum_str(desc.compareFunction)
                 except AttributeError:
                     pass
 
@@ -679,87 +891,172 @@ class PipelineService:
         return samplers
 
     def _get_stage_cbuffers(self, controller, pipe, stage, reflection):
-        """Get constant buffers for a stage from shader reflection"""
-        cbuffers = []
+        """Get constant buffers for a stage from shader reflection.
+
+        The layout only depends on the reflection, so it is built once per
+        (shader, entry point) and shared by every event using the shader."""
+        if not reflection:
+            return []
+
         try:
-            if not reflection:
-                return cbuffers
+            key = (Parsers.resource_key(reflection.resourceId), reflection.entryPoint)
+        except Exception:
+            key = None
+        cached = self._cache.get("stage_cbuffers", dict)
+        if key is not None and key in cached:
+            return cached[key]
 
-            for cb in reflection.constantBlocks:
-                slot = cb.bindPoint if hasattr(cb, 'bindPoint') else cb.fixedBindNumber
+        cbuffers = []
+        try:
+            constant_blocks = reflection.constantBlocks
+            # All blocks of one reflection share a type; resolve the slot
+            # attribute once rather than probing every block.
+            slot_attr = "fixedBindNumber"
+            if constant_blocks and hasattr(constant_blocks[0], "bindPoint"):
+                slot_attr = "bindPoint"
+            get_slot = operator.attrgetter(slot_attr)
+
+            for cb in constant_blocks:
+                slot = get_slot(cb)
+                variables = cb.variables
                 cb_info = {
                     "slot": slot,
                     "name": cb.name,
                     "byte_size": cb.byteSize,
-                    "variable_count": len(cb.variables) if cb.variables else 0,
-                    "variables": [],
-                }
-                if cb.variables:
-                    for var in cb.variables:
-                        cb_info["variables"].append({
+                    "variable_count": len(variables) if variables else 0,
+                    "variables": [
+                        {
                             "name": var.name,
                             "byte_offset": var.byteOffset,
                             "type": str(var.type.name) if var.type else "",
-                        })
+                        }
+                        for var in variables or ()
+                    ],
+                }
                 cbuffers.append(cb_info)
-
         except Exception as e:
             cbuffers.append({"error": str(e)})
+            return cbuffers
 
+        if key is not None:
+            cached[key] = cbuffers
         return cbuffers
 
+    def _reflection_name_maps(self, reflection):
+        """Get (srv, uav, sampler) bind slot -> name maps for a shader.
+
+        Reflection is immutable per shader, so the maps are built once per
+        (shader, entry point) and reused across events sharing the shader."""
+        if not reflection:
+            return _EMPTY_NAME_MAPS
+
+        key = (Parsers.resource_key(reflection.resourceId), reflection.entryPoint)
+        cached = self._cache.get("reflection_names", dict)
+        maps = cached.get(key)
+        if maps is None:
+            maps = (
+                self._bind_name_map(reflection.readOnlyResources),
+                self._bind_name_map(reflection.readWriteResources),
+                self._bind_name_map(reflection.samplers),
+            )
+            cached[key] = maps
+        return maps
+
+    @staticmethod
+    def _bind_name_map(entries):
+        """Map bind slot -> name for reflection resources or samplers"""
+        name_map = {}
+        for res in entries:
+            bind = getattr(res, 'fixedBindNumber', getattr(res, 'bindPoint', -1))
+            name_map[bind] = res.name
+        return name_map
+
+    def _get_resource_maps(self, controller):
+        """Get the capture's resource lookup dicts, building them on first use"""
+        return self._cache.get(
+            "resource_maps", lambda: self._build_resource_maps(controller)
+        )
+
     @staticmethod
     def _build_resource_maps(controller):
-        """Build resource ID -> info lookup dicts (call once per BlockInvoke).
-        Uses str(resourceId) as keys since ResourceId may not be hashable."""
-        tex_map = {}
+        """Build resource ID -> info lookup dicts (call from a BlockInvoke).
+        Keyed by Parsers.resource_key since ResourceId may not be hashable.
+
+        res_details holds the ready-to-merge texture/buffer details for each
+        resource and tex_meta holds (format name, width, height) per texture,
+        so binding lookups don't go back through SWIG on every event."""
+        res_details = {}
+        tex_meta = {}
         for tex in controller.GetTextures():
-            tex_map[str(tex.resourceId)] = tex
-        buf_map = {}
+            key = Parsers.resource_key(tex.resourceId)
+            fmt_name = str(tex.format.Name())
+            res_details[key] = {
+                "type": "texture",
+                "width": tex.width,
+                "height": tex.height,
+                "depth": tex.depth,
+                "array_size": tex.arraysize,
+                "mip_levels": tex.mips,
+                "format": fmt_name,
+                "dimension": str(tex.type),
+                "msaa_samples": tex.msSamp,
+            }
+            tex_meta[key] = (fmt_name, tex.width, tex.height)
         for buf in controller.GetBuffers():
-            buf_map[str(buf.resourceId)] = buf
-        return tex_map, buf_map
-
-    def _get_resource_details(self, resource_id, tex_map, buf_map):
-        """Get details about a resource using pre-built lookup maps"""
-        details = {}
-
-        try:
-            resource_name = self.ctx.GetResourceName(resource_id)
-            if resource_name:
-                details["resource_name"] = resource_name
-        except Exception:
-            pass
-
-        key = str(resource_id)
-        tex = tex_map.get(key)
-        if tex is not None:
-            details["type"] = "texture"
-            details["width"] = tex.width
-            details["height"] = tex.height
-            details["depth"] = tex.depth
-            details["array_size"] = tex.arraysize
-            details["mip_levels"] = tex.mips
-            details["format"] = str(tex.format.Name())
-            details["dimension"] = str(tex.type)
-            details["msaa_samples"] = tex.msSamp
-            return details
-
-        buf = buf_map.get(key)
-        if buf is not None:
-            details["type"] = "buffer"
-            details["length"] = buf.length
-            return details
-
+            key = Parsers.resource_key(buf.resourceId)
+            if key not in res_details:
+                res_details[key] = {"type": "buffer", "length": buf.length}
+        return res_details, tex_meta
+
+    def _get_resource_details(self, resource_id, key, res_details):
+        """Get details about a resource using the pre-built details map.
+
+        key is the caller's Parsers.resource_key(resource_id)."""
+        # The same resources are bound across many stages and events
+        names = self._cache.get("resource_names", dict)
+        resource_name = names.get(key)
+        if resource_name is None:
+            try:
+                resource_name = self.ctx.GetResourceName(resource_id) or ""
+            except Exception:
+                resource_name = ""
+            names[key] = resource_name
+
+        baked = res_details.get(key, _EMPTY_DETAILS)
+        if not resource_name:
+            return baked
+        details = {"resource_name": resource_name}
+        details.update(baked)
         return details
 
-    def _get_cbuffer_info(self, controller, pipe, reflection, stage):
+    def _get_cbuffer_info(self, controller, pipe, reflection, stage, event_id):
         """Get constant buffer information and values"""
-        cbuffers = []
+        constant_blocks = reflection.constantBlocks
+        cbuffers = [None] * len(constant_blocks)
         get_constant_buffer = getattr(pipe, "GetConstantBuffer", None)
         can_read_values = callable(get_constant_buffer)
+        cb_cache = self._cache.get("cbuffer_contents", OrderedDict)
+        layouts = self._cache.get("cbuffer_layouts", dict)
+        # Loop-invariant arguments of GetCBufferVariableContents
+        shader_id = reflection.resourceId
+        entry_point = reflection.entryPoint
+        shader_key = (
+            event_id,
+            int(stage),
+            Parsers.resource_key(shader_id),
+            entry_point,
+        )
+        contents_error = None
+        if can_read_values and constant_blocks:
+            # A failure here only affects the buffers that need a readback,
+            # so it is reported on those rather than failing the whole call.
+            try:
+                read_contents = controller.GetCBufferVariableContents
+                contents_args = (pipe.GetGraphicsPipelineObject(), shader_id, stage, entry_point)
+            except Exception as e:
+                contents_error = str(e)
 
-        for i, cb in enumerate(reflection.constantBlocks):
+        for i, cb in enumerate(constant_blocks):
             cb_info = {
                 "name": cb.name,
                 "slot": i,
@@ -770,18 +1067,14 @@ class PipelineService:
             if can_read_values:
                 try:
                     bind = get_constant_buffer(stage, i, 0)
-                    if bind.resourceId != rd.ResourceId.Null():
-                        variables = controller.GetCBufferVariableContents(
-                            pipe.GetGraphicsPipelineObject(),
-                            reflection.resourceId,
-                            stage,
-                            reflection.entryPoint,
-                            i,
-                            bind.resourceId,
-                            bind.byteOffset,
-                            bind.byteSize,
-                        )
-                        cb_info["variables"] = Serializers.serialize_variables(variables)
+                    if bind.resourceId != _NULL_RESOURCE_ID:
+                        if contents_error is not None:
+                            cb_info["error"] = contents_error
+                        else:
+                            cb_info["variables"] = self._get_cbuffer_variables(
+                                read_contents, contents_args, i, bind, cb_cache,
+                                shader_key, layouts,
+                            )
                 except Exception as e:
                     cb_info["error"] = str(e)
             else:
@@ -789,37 +1082,69 @@ class PipelineService:
                     "PipeState.GetConstantBuffer is unavailable in this RenderDoc build."
                 )
 
-            cbuffers.append(cb_info)
+            cbuffers[i] = cb_info
 
         return cbuffers
 
+    @staticmethod
+    def _get_cbuffer_variables(
+        read_contents, contents_args, slot, bind, cb_cache, shader_key, layouts
+    ):
+        """Read and serialize one constant buffer, reusing earlier readbacks
+        of the same binding at the same event.
+
+        A cbuffer's layout only depends on the shader, so it is captured on
+        the first readback and reused for every later event."""
+        key = shader_key + (
+            slot,
+            Parsers.resource_key(bind.resourceId),
+            bind.byteOffset,
+            bind.byteSize,
+        )
+        variables = cb_cache.get(key)
+        if variables is not None:
+            cb_cache.move_to_end(key)
+            return variables
+
+        raw_vars = read_contents(
+            *contents_args, slot, bind.resourceId, bind.byteOffset, bind.byteSize
+        )
+        # shader_key minus the event id
+        layout_key = shader_key[1:] + (slot,)
+        layout = layouts.get(layout_key)
+        if layout is None:
+            layout = layouts[layout_key] = Serializers.variable_layout(raw_vars)
+        variables = Serializers.serialize_variables_with_layout(raw_vars, layout)
+        cb_cache[key] = variables
+        if len(cb_cache) > _CBUFFER_CACHE_LIMIT:
+            cb_cache.popitem(last=False)
+        return variables
+
     def _get_resource_bindings(self, reflection):
         """Get shader resource bindings"""
-        resources = []
-
         try:
-            for res in reflection.readOnlyResources:
-                resources.append(
-                    {
-                        "name": res.name,
-                        "type": str(res.resType),
-                        "binding": res.fixedBindNumber,
-                        "access": "ReadOnly",
-                    }
-                )
+            resources = [
+                {
+                    "name": res.name,
+                    "type": str(res.resType),
+                    "binding": res.fixedBindNumber,
+                    "access": "ReadOnly",
+                }
+                for res in reflection.readOnlyResources
+            ]
         except Exception:
-            pass
+            resources = []
 
         try:
-            for res in reflection.readWriteResources:
-                resources.append(
-                    {
-                        "name": res.name,
-                        "type": str(res.resType),
-                        "binding": res.fixedBindNumber,
-                        "access": "ReadWrite",
-                    }
-                )
+            resources.extend([
+                {
+                    "name": res.name,
+                    "type": str(res.resType),
+                    "binding": res.fixedBindNumber,
+                    "access": "ReadWrite",
+                }
+                for res in reflection.readWriteResources
+            ])
         except Exception:
             pass
 
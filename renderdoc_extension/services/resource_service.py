@@ -3,10 +3,11 @@ Resource information service for RenderDoc.
 """
 
 import base64
+import binascii
 
 import renderdoc as rd
 
-from ..utils import Parsers
+from ..utils import CaptureCache, Parsers
 
 
 class ResourceService:
@@ -15,16 +16,47 @@ class ResourceService:
     def __init__(self, ctx, invoke_fn):
         self.ctx = ctx
         self._invoke = invoke_fn
+        self._cache = CaptureCache(ctx)
+
+    def invalidate_caches(self):
+        """Drop capture-scoped caches (called after a capture is loaded)."""
+        self._cache.clear()
 
     def _find_texture_by_id(self, controller, resource_id):
         """Find texture by resource ID"""
         target_id = Parsers.extract_numeric_id(resource_id)
-        for tex in controller.GetTextures():
-            tex_id_str = str(tex.resourceId)
-            tex_id = Parsers.extract_numeric_id(tex_id_str)
-            if tex_id == target_id:
-                return tex
-        return None
+        textures = self._cache.get(
+            "textures_by_id", lambda: self._build_id_map(controller.GetTextures())
+        )
+        return textures.get(target_id)
+
+    def _texture_strings(self, tex_desc):
+        """(format, dimension) strings for a texture, stringified once per capture"""
+        strings = self._cache.get("texture_strings", dict)
+        key = Parsers.resource_key(tex_desc.resourceId)
+        cached = strings.get(key)
+        if cached is None:
+            cached = strings[key] = (str(tex_desc.format.Name()), str(tex_desc.type))
+        return cached
+
+    def _find_buffer_by_id(self, controller, target_id):
+        """Find buffer by numeric resource ID"""
+        buffers = self._cache.get(
+            "buffers_by_id", lambda: self._build_id_map(controller.GetBuffers())
+        )
+        return buffers.get(target_id)
+
+    @staticmethod
+    def _build_id_map(descriptions):
+        """Map numeric resource ID -> description, skipping unparseable IDs"""
+        by_id = {}
+        for desc in descriptions:
+            try:
+                key = Parsers.resource_key(desc.resourceId)
+            except Exception:
+                continue
+            by_id[key] = desc
+        return by_id
 
     def get_buffer_contents(self, resource_id, offset=0, length=0, event_id=None):
         """Get buffer data"""
@@ -49,17 +81,8 @@ class ResourceService:
                 return
 
             # Find buffer
-            buf_desc = None
-            rid = rd.ResourceId.Null()
-            for buf in controller.GetBuffers():
-                try:
-                    buf_id = Parsers.extract_numeric_id(str(buf.resourceId))
-                except Exception:
-                    continue
-                if buf_id == target_id:
-                    buf_desc = buf
-                    rid = buf.resourceId
-                    break
+            buf_desc = self._find_buffer_by_id(controller, target_id)
+            rid = buf_desc.resourceId if buf_desc else rd.ResourceId.Null()
 
             if not buf_desc:
                 # Fallback: try direct parse path for forks where GetBuffers()
@@ -83,14 +106,19 @@ class ResourceService:
             # Get data
             actual_length = length if length > 0 else buf_desc.length
             data = controller.GetBufferData(rid, offset, actual_length)
+            data_length = len(data)
+            # Drop the raw bytes before building the str so large buffers
+            # don't hold raw + encoded bytes + str at once.
+            encoded = binascii.b2a_base64(data, newline=False)
+            del data
 
             result["data"] = {
                 "resource_id": resource_id,
                 "event_id": event_id,
-                "length": len(data),
+                "length": data_length,
                 "total_size": buf_desc.length,
                 "offset": offset,
-                "content_base64": base64.b64encode(data).decode("ascii"),
+                "content_base64": encoded.decode("ascii"),
             }
 
         self._invoke(callback)
@@ -114,6 +142,7 @@ class ResourceService:
                     result["error"] = "Texture not found: %s" % resource_id
                     return
 
+                fmt_name, dimension = self._texture_strings(tex_desc)
                 tex_info = {
                     "resource_id": resource_id,
                     "name": "",
@@ -122,8 +151,8 @@ class ResourceService:
                     "depth": tex_desc.depth,
                     "array_size": tex_desc.arraysize,
                     "mip_levels": tex_desc.mips,
-                    "format": str(tex_desc.format.Name()),
-                    "dimension": str(tex_desc.type),
+                    "format": fmt_name,
+                    "dimension": dimension,
                     "msaa_samples": tex_desc.msSamp,
                 }
                 try:
@@ -244,9 +273,17 @@ class ResourceService:
                 bytes_per_slice = total_size // mip_depth
                 slice_start = depth_slice * bytes_per_slice
                 slice_end = slice_start + bytes_per_slice
-                data = data[slice_start:slice_end]
+                # Zero-copy view; the slice is only copied once, by the encoder
+                data = memoryview(data)[slice_start:slice_end]
                 output_depth = 1
 
+            fmt_name, dimension = self._texture_strings(tex_desc)
+            data_length = len(data)
+            # Drop the raw bytes before building the str so large textures
+            # don't hold raw + encoded bytes + str at once.
+            encoded = binascii.b2a_base64(data, newline=False)
+            del data
+
             result["data"] = {
                 "resource_id": resource_id,
                 "event_id": event_id,
@@ -257,12 +294,12 @@ class ResourceService:
                 "slice": slice,
                 "sample": sample,
                 "depth_slice": depth_slice,
-                "format": str(tex_desc.format.Name()),
-                "dimension": str(tex_desc.type),
+                "format": fmt_name,
+                "dimension": dimension,
                 "is_3d": is_3d,
                 "total_depth": mip_depth if is_3d else 1,
-                "data_length": len(data),
-                "content_base64": base64.b64encode(data).decode("ascii"),
+                "data_length": data_length,
+                "content_base64": encoded.decode("ascii"),
             }
 
         self._invoke(callback)
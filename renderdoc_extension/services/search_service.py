@@ -4,7 +4,10 @@ Reverse lookup search service for RenderDoc.
 
 import renderdoc as rd
 
-from ..utils import Parsers, Helpers
+from ..utils import CaptureCache, Parsers, Helpers
+
+
+_DRAW_FLAGS = rd.ActionFlags.Drawcall | rd.ActionFlags.Dispatch
 
 
 class SearchService:
@@ -13,14 +16,55 @@ class SearchService:
     def __init__(self, ctx, invoke_fn):
         self.ctx = ctx
         self._invoke = invoke_fn
+        self._cache = CaptureCache(ctx)
+
+    def invalidate_caches(self):
+        """Drop capture-scoped caches (called after a capture is loaded)."""
+        self._cache.clear()
+
+    def _get_name_cache(self, controller):
+        """Get the capture's resource key -> name dict (call from a BlockInvoke).
+
+        Seeded with every texture and buffer in one pass; other resources
+        (e.g. shaders) are added on first lookup via _lookup_name."""
+        return self._cache.get("resource_names", lambda: self._build_name_cache(controller))
+
+    def _build_name_cache(self, controller):
+        """Name every texture and buffer once"""
+        names = {}
+        for res in list(controller.GetTextures()) + list(controller.GetBuffers()):
+            try:
+                names[Parsers.resource_key(res.resourceId)] = (
+                    self.ctx.GetResourceName(res.resourceId) or ""
+                )
+            except Exception:
+                pass
+        return names
 
-    def _search_draws(self, matcher_fn, max_results=0):
+    def _lookup_name(self, names, resource_id):
+        """Resource name from the name cache, fetching and storing misses"""
+        key = Parsers.resource_key(resource_id)
+        try:
+            return names[key]
+        except KeyError:
+            pass
+        try:
+            name = self.ctx.GetResourceName(resource_id) or ""
+        except Exception:
+            name = ""
+        names[key] = name
+        return name
+
+    def _search_draws(self, matcher_fn, max_results=0, precheck_fn=None):
         """
         Common template for searching draw calls.
 
         Args:
             matcher_fn: Function(pipe, controller, action, ctx) -> match_reason or None
             max_results: Stop after finding this many matches (0 = unlimited)
+            precheck_fn: Optional Function(controller) -> bool, run once before
+                the per-draw SetFrameEvent loop. Returning False means no draw
+                can match, so the loop is skipped entirely.
         """
         if not self.ctx.IsCaptureLoaded():
             raise ValueError("No capture loaded")
@@ -30,30 +74,36 @@ class SearchService:
         def callback(controller):
             root_actions = controller.GetRootActions()
             structured_file = controller.GetStructuredFile()
-            all_actions = Helpers.flatten_actions(root_actions)
-
-            # Filter to only draw calls and dispatches
-            draw_actions = [
-                a for a in all_actions
-                if a.flags & (rd.ActionFlags.Drawcall | rd.ActionFlags.Dispatch)
-            ]
+            # Only draw calls and dispatches
+            draw_actions = Helpers.flatten_actions(root_actions, _DRAW_FLAGS)
             result["scanned_draws"] = len(draw_actions)
 
+            if precheck_fn is not None and not precheck_fn(controller):
+                return
+
+            # (action, reason) pairs during the scan; the JSON dicts are only
+            # built once the scan is done
+            matched = []
             for action in draw_actions:
                 controller.SetFrameEvent(action.eventId, False)
                 pipe = controller.GetPipelineState()
 
                 match_reason = matcher_fn(pipe, controller, action, self.ctx)
                 if match_reason:
-                    result["matches"].append({
-                        "event_id": action.eventId,
-                        "name": action.GetName(structured_file),
-                        "match_reason": match_reason,
-                    })
-                    if max_results > 0 and len(result["matches"]) >= max_results:
+                    matched.append((action, match_reason))
+                    if max_results > 0 and len(matched) >= max_results:
                         result["truncated"] = True
                         break
 
+            result["matches"] = [
+                {
+                    "event_id": action.eventId,
+                    "name": action.GetName(structured_file),
+                    "match_reason": match_reason,
+                }
+                for action, match_reason in matched
+            ]
+
         self._invoke(callback)
         result["total_matches"] = len(result["matches"])
         return result
@@ -65,6 +115,12 @@ class SearchService:
             stages_to_check = [Parsers.parse_stage(stage)]
         else:
             stages_to_check = Helpers.get_all_shader_stages()
+        needle = shader_name.lower()
+        # Many draws share a handful of shaders: remember per entry point /
+        # shader id whether it matched, rather than re-fetching and
+        # lowercasing the names for every draw.
+        entry_point_matches = {}
+        matching_shader_names = {}
 
         def matcher(pipe, controller, action, ctx):
             for s in stages_to_check:
@@ -75,15 +131,25 @@ class SearchService:
                 reflection = pipe.GetShaderReflection(s)
                 if reflection:
                     entry_point = pipe.GetShaderEntryPoint(s)
-                    shader_debug_name = ""
-                    try:
-                        shader_debug_name = ctx.GetResourceName(shader)
-                    except Exception:
-                        pass
-
-                    if shader_name.lower() in entry_point.lower():
+                    ep_match = entry_point_matches.get(entry_point)
+                    if ep_match is None:
+                        ep_match = entry_point_matches[entry_point] = (
+                            needle in entry_point.lower()
+                        )
+                    if ep_match:
                         return "%s entry_point: '%s'" % (str(s), entry_point)
-                    elif shader_debug_name and shader_name.lower() in shader_debug_name.lower():
+
+                    key = Parsers.resource_key(shader)
+                    try:
+                        shader_debug_name = matching_shader_names[key]
+                    except KeyError:
+                        shader_debug_name = self._lookup_name(
+                            self._get_name_cache(controller), shader
+                        )
+                        if needle not in shader_debug_name.lower():
+                            shader_debug_name = ""
+                        matching_shader_names[key] = shader_debug_name
+                    if shader_debug_name:
                         return "%s name: '%s'" % (str(s), shader_debug_name)
             return None
 
@@ -92,6 +158,16 @@ class SearchService:
     def find_draws_by_texture(self, texture_name, max_results=0):
         """Find all draw calls using a texture with the given name (partial match)."""
         stages_to_check = Helpers.get_all_shader_stages()
+        needle = texture_name.lower()
+        # resource key -> name, for the named resources matching needle.
+        # Built once per search instead of naming every binding of every draw.
+        matching_names = {}
+
+        def precheck(controller):
+            for key, res_name in self._get_name_cache(controller).items():
+                if res_name and needle in res_name.lower():
+                    matching_names[key] = res_name
+            return bool(matching_names)
 
         def matcher(pipe, controller, action, ctx):
             # Check SRVs (read-only resources)
@@ -99,14 +175,10 @@ class SearchService:
                 try:
                     srvs = pipe.GetReadOnlyResources(stage, False)
                     for srv in srvs:
-                        if srv.descriptor.resource == rd.ResourceId.Null():
-                            continue
-                        res_name = ""
-                        try:
-                            res_name = ctx.GetResourceName(srv.descriptor.resource)
-                        except Exception:
-                            pass
-                        if res_name and texture_name.lower() in res_name.lower():
+                        res_name = matching_names.get(
+                            Parsers.resource_key(srv.descriptor.resource)
+                        )
+                        if res_name:
                             return "%s SRV: '%s'" % (str(stage), res_name)
                 except Exception:
                     pass
@@ -115,14 +187,10 @@ class SearchService:
                 try:
                     uavs = pipe.GetReadWriteResources(stage, False)
                     for uav in uavs:
-                        if uav.descriptor.resource == rd.ResourceId.Null():
-                            continue
-                        res_name = ""
-                        try:
-                            res_name = ctx.GetResourceName(uav.descriptor.resource)
-                        except Exception:
-                            pass
-                        if res_name and texture_name.lower() in res_name.lower():
+                        res_name = matching_names.get(
+                            Parsers.resource_key(uav.descriptor.resource)
+                        )
+                        if res_name:
                             return "%s UAV: '%s'" % (str(stage), res_name)
                 except Exception:
                     pass
@@ -132,63 +200,92 @@ class SearchService:
                 om = pipe.GetOutputMerger()
                 if om:
                     for i, rt in enumerate(om.renderTargets):
-                        if rt.resourceId != rd.ResourceId.Null():
-                            res_name = ""
-                            try:
-                                res_name = ctx.GetResourceName(rt.resourceId)
-                            except Exception:
-                                pass
-                            if res_name and texture_name.lower() in res_name.lower():
-                                return "RenderTarget[%d]: '%s'" % (i, res_name)
+                        res_name = matching_names.get(Parsers.resource_key(rt.resourceId))
+                        if res_name:
+                            return "RenderTarget[%d]: '%s'" % (i, res_name)
             except Exception:
                 pass
 
             return None
 
-        return self._search_draws(matcher, max_results=max_results)
+        return self._search_draws(
+            matcher, max_results=max_results, precheck_fn=precheck
+        )
 
     def find_draws_by_resource(self, resource_id, max_results=0):
         """Find all draw calls using a specific resource ID (exact match)."""
         target_rid = Parsers.parse_resource_id(resource_id)
+        # Compare plain ints rather than ResourceId objects per binding
+        target_key = Parsers.resource_key(target_rid)
         stages_to_check = Helpers.get_all_shader_stages()
 
+        def precheck(controller):
+            # An id that isn't a resource of this capture can't be bound, so
+            # skip replaying every draw for it.
+            try:
+                resources = controller.GetResources()
+            except Exception:
+                return True
+            return any(
+                Parsers.resource_key(res.resourceId) == target_key
+                for res in resources
+            )
+
         def matcher(pipe, controller, action, ctx):
-            # Check shaders
-            for stage in stages_to_check:
-                shader = pipe.GetShader(stage)
-                if shader == target_rid:
-                    return "%s shader" % str(stage)
+            return next(
+                self._iter_resource_uses(pipe, stages_to_check, target_key), None
+            )
 
-            # Check SRVs and UAVs
-            for stage in stages_to_check:
+        return self._search_draws(
+            matcher, max_results=max_results, precheck_fn=precheck
+        )
+
+    @staticmethod
+    def _iter_resource_uses(pipe, stages_to_check, target_key):
+        """Lazily yield match reasons for target_key in the bound pipeline
+        state, in priority order, so the caller can stop at the first one."""
+        resource_key = Parsers.resource_key
+
+        # Check shaders
+        for stage in stages_to_check:
+            if resource_key(pipe.GetShader(stage)) == target_key:
+                yield "%s shader" % str(stage)
+
+        # Check SRVs and UAVs
+        for stage in stages_to_check:
+            try:
+                srvs = pipe.GetReadOnlyResources(stage, False)
+            except Exception:
+                srvs = ()
+            for srv in srvs:
                 try:
-                    srvs = pipe.GetReadOnlyResources(stage, False)
-                    for srv in srvs:
-                        if srv.descriptor.resource == target_rid:
-                            return "%s SRV slot %d" % (str(stage), srv.access.index)
+                    if resource_key(srv.descriptor.resource) == target_key:
+                        yield "%s SRV slot %d" % (str(stage), srv.access.index)
                 except Exception:
-                    pass
+                    break
 
+            try:
+                uavs = pipe.GetReadWriteResources(stage, False)
+            except Exception:
+                uavs = ()
+            for uav in uavs:
                 try:
-                    uavs = pipe.GetReadWriteResources(stage, False)
-                    for uav in uavs:
-                        if uav.descriptor.resource == target_rid:
-                            return "%s UAV slot %d" % (str(stage), uav.access.index)
+                    if resource_key(uav.descriptor.resource) == target_key:
+                        yield "%s UAV slot %d" % (str(stage), uav.access.index)
                 except Exception:
-                    pass
+                    break
 
-            # Check render targets
+        # Check render targets
+        try:
+            om = pipe.GetOutputMerger()
+        except Exception:
+            om = None
+        if om:
             try:
-                om = pipe.GetOutputMerger()
-                if om:
-                    for i, rt in enumerate(om.renderTargets):
-                        if rt.resourceId == target_rid:
-                            return "RenderTarget[%d]" % i
-                    if om.depthTarget.resourceId == target_rid:
-                        return "DepthTarget"
+                for i, rt in enumerate(om.renderTargets):
+                    if resource_key(rt.resourceId) == target_key:
+                        yield "RenderTarget[%d]" % i
+                if resource_key(om.depthTarget.resourceId) == target_key:
+                    yield "DepthTarget"
             except Exception:
                 pass
-
-            return None
-
-        return self._search_draws(matcher, max_results=max_results)
@@ -3,13 +3,23 @@ File-based IPC Server for RenderDoc MCP Bridge
 Uses file polling since RenderDoc's Python doesn't have socket/QtNetwork modules.
 """
 
+import collections
 import json
 import os
+import queue
+import struct
+import sys
 import traceback
 import tempfile
 import threading
 import time
 
+try:
+    # Not shipped with RenderDoc; speeds up request decoding when present
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # IPC directory
 IPC_DIR = os.path.join(tempfile.gettempdir(), "renderdoc_mcp")
@@ -24,10 +34,277 @@ INFLIGHT_REQUEST_FILE = os.path.join(IPC_DIR, "request.inflight.json")
 INFLIGHT_REQUEST_FILE_PREFIX = "request.inflight."
 RESPONSE_FILE_PREFIX = "response."
 
+# Containment check for client-supplied response paths (normcase so the
+# comparison stays case-insensitive on Windows, like commonpath was)
+_IPC_DIR_ABS = os.path.abspath(IPC_DIR)
+_IPC_DIR_NORM = os.path.normcase(_IPC_DIR_ABS)
+_IPC_DIR_NORM_SEP = os.path.join(_IPC_DIR_NORM, "")
+
 # Processing timeout: if a handler is stuck for longer than this, force-reset
 PROCESSING_TIMEOUT = float(os.environ.get("RENDERDOC_MCP_PROCESSING_TIMEOUT", "420.0"))
 HEARTBEAT_INTERVAL = float(os.environ.get("RENDERDOC_MCP_HEARTBEAT_INTERVAL", "1.0"))
 
+# Directory-scan name filters. Both sides only ever write lowercase names
+# (fixed prefixes plus uuid4 hex ids), so names are matched as-is.
+_SPOOL_PREFIXES = (REQUEST_FILE_PREFIX, RESPONSE_FILE_PREFIX)
+_SPOOL_SUFFIXES = (".json", ".json.tmp")
+_CLEANUP_NAMES = frozenset(("bridge_diagnostics.json", "bridge_diagnostics.json.tmp"))
+
+# Bounded bookkeeping: recent errors kept for diagnostics, and finished
+# request ids remembered to drop duplicate completions.
+_RECENT_ERRORS_LIMIT = 32
+_TERMINAL_REQUEST_LIMIT = 2048
+
+# Request status -> counters bumped on top of total_completed
+_STATUS_METRICS = {
+    "error": ("total_errors",),
+    "exception": ("total_errors",),
+    "timeout": ("total_errors", "total_timeouts"),
+    "stale_discarded": ("total_stale_responses",),
+    "json_error": ("total_json_errors",),
+}
+
+# How long the poll loop sleeps between directory scans when it has no change
+# notification (non-Linux hosts), and the backstop wait when it does.
+POLL_INTERVAL = 0.1
+NOTIFY_IDLE_WAIT = 1.0
+
+# Compact separators keep large digests small on disk; encoding the whole
+# document up front avoids json.dump's many small chunked writes.
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def _encode_json(payload):
+    """
+    Encode payload to compact JSON bytes.
+
+    Always the stdlib encoder: orjson writes NaN/Infinity as null, and
+    non-finite floats in constants or pixel values are exactly what a GPU
+    debugger needs to report. The client decodes the NaN/Infinity tokens.
+    """
+    # The stdlib encoder escapes non-ASCII, so this is already valid UTF-8.
+    return _JSON_ENCODER.encode(payload).encode("ascii")
+
+
+def _decode_json(raw):
+    """Decode the raw bytes of a request file."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity tokens; let the stdlib decide
+            pass
+    return json.loads(raw)
+
+
+# O_BINARY only exists (and matters) on Windows
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_file_bytes(path, data):
+    """
+    Write data to path with raw os.write calls: no file object or buffer
+    flush machinery. No fsync either; the IPC files are transient and
+    living in the temp dir (often tmpfs) they don't need durability.
+    """
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        _write_fd(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _write_fd(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+# Linux only; cleared if the IPC directory's filesystem rejects it
+_O_TMPFILE = getattr(os, "O_TMPFILE", 0)
+
+
+def _link_file_bytes(path, data):
+    """
+    Write data to an unnamed O_TMPFILE inode in path's directory, then give
+    it its name with linkat, so no directory scan ever sees a partial or
+    .tmp file. Returns False, having created nothing, where that isn't
+    possible: no O_TMPFILE, or path already exists (linkat can't replace).
+    """
+    global _O_TMPFILE
+    if not _O_TMPFILE:
+        return False
+    try:
+        fd = os.open(os.path.dirname(path), _O_TMPFILE | os.O_WRONLY, 0o644)
+    except OSError:
+        _O_TMPFILE = 0
+        return False
+    try:
+        _write_fd(fd, data)
+        # The /proc link resolves to the open inode (linkat AT_SYMLINK_FOLLOW)
+        os.link("/proc/self/fd/%d" % fd, path)
+    except FileExistsError:
+        return False
+    except OSError:
+        # e.g. no /proc, or a sandbox where the link reports EXDEV
+        _O_TMPFILE = 0
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def _remove_quietly(path):
+    """Remove path if it exists; one syscall instead of exists() + remove()."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _PollWaiter:
+    """
+    Sleeps between poll passes. wake() cuts the current sleep short, e.g. when
+    a handler finishes and queued requests can be claimed.
+    """
+
+    idle_wait = POLL_INTERVAL
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def wait(self, timeout):
+        self._event.wait(timeout)
+        self._event.clear()
+
+    def wake(self):
+        self._event.set()
+
+    def close(self):
+        pass
+
+
+class _InotifyWaiter:
+    """
+    Linux-only waiter that blocks until a request file lands in the watched
+    directory instead of rescanning it every POLL_INTERVAL.
+    """
+
+    idle_wait = NOTIFY_IDLE_WAIT
+
+    # <sys/inotify.h>
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_TO = 0x00000080
+    _IN_DELETE = 0x00000200
+    _IN_NONBLOCK = 0o4000
+    # struct inotify_event: wd, mask, cookie, len, then len bytes of name
+    _EVENT_HEADER = struct.Struct("iIII")
+    _LOCK_NAME = os.fsencode(os.path.basename(LOCK_FILE))
+    _IN_CLOEXEC = 0o2000000
+
+    def __init__(self, path):
+        import ctypes
+        import select
+
+        self._select = select.select
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self._IN_CLOSE_WRITE | self._IN_MOVED_TO | self._IN_DELETE
+        if libc.inotify_add_watch(fd, os.fsencode(path), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, "inotify_add_watch failed")
+        self._fd = fd
+        # Self-pipe so wake() can interrupt the select()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        # Guards the fds against a late wake() racing close(): the numbers
+        # may be reused by the host once closed.
+        self._close_lock = threading.Lock()
+        self._closed = False
+
+    @staticmethod
+    def _drain(fd):
+        data = b""
+        while True:
+            try:
+                chunk = os.read(fd, 4096)
+            except (BlockingIOError, InterruptedError):
+                return data
+            if not chunk:
+                return data
+            data += chunk
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while not self._closed:
+            ready, _, _ = self._select([self._fd, self._wake_r], [], [], timeout)
+            if not ready:
+                return
+            if self._wake_r in ready:
+                self._drain(self._wake_r)
+                return
+            if self._wants_poll(self._drain(self._fd)):
+                return
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return
+
+    @classmethod
+    def _wants_poll(cls, events):
+        """
+        True if the drained inotify records include a new pending request
+        or a released legacy lock. Heartbeat/diagnostics/response writes,
+        client temp files and the server's own request.inflight.* renames
+        share the directory and are ignored.
+        """
+        header = cls._EVENT_HEADER
+        offset = 0
+        end = len(events)
+        while offset + header.size <= end:
+            _, mask, _, name_len = header.unpack_from(events, offset)
+            offset += header.size
+            name = events[offset:offset + name_len].rstrip(b"\0")
+            offset += name_len
+            if mask & cls._IN_DELETE:
+                if name == cls._LOCK_NAME:
+                    return True
+            elif MCPBridgeServer._is_pending_request_name(os.fsdecode(name)):
+                return True
+        return False
+
+    def wake(self):
+        with self._close_lock:
+            if self._closed:
+                return
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass
+
+    def close(self):
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            for fd in (self._fd, self._wake_r, self._wake_w):
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+
+def _create_waiter(path):
+    if sys.platform.startswith("linux"):
+        try:
+            return _InotifyWaiter(path)
+        except Exception:
+            pass
+    return _PollWaiter()
+
 
 class MCPBridgeServer:
     """File-based IPC server for MCP bridge communication"""
@@ -36,14 +313,23 @@ class MCPBridgeServer:
         self.handler = handler
         self._thread = None
         self._running = False
-        self._processing_since = None  # timestamp when processing started, or None
+        # time.monotonic() when processing started, or None. Intervals use the
+        # monotonic clock so wall-clock jumps can't fake or hide a timeout;
+        # time.time() is kept for values other processes compare against.
+        self._processing_since = None
         self._current_request_id = None  # id of the request being processed
         self._current_request_method = None
         self._current_response_path = RESPONSE_FILE
         self._current_processing_timeout = PROCESSING_TIMEOUT
         self._heartbeat_thread = None
-        self._started_at = time.time()
+        self._waiter = None
+        self._work_queue = None  # feeds the handler worker thread
+        # Request files seen by the last directory scan, oldest first
+        self._pending_requests = collections.deque()
+        self._started_at = time.monotonic()
         self._stats_lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._log_file = None  # opened on first _log(), line-buffered
         self._metrics = {
             "total_received": 0,
             "total_completed": 0,
@@ -54,22 +340,40 @@ class MCPBridgeServer:
             "total_poll_errors": 0,
         }
         self._last_request = None
-        self._recent_errors = []
+        self._recent_errors = collections.deque(maxlen=_RECENT_ERRORS_LIMIT)
         self._terminal_request_ids = set()
-        self._terminal_request_order = []
+        self._terminal_request_order = collections.deque()
+        # Bumped under _stats_lock on every metrics/error change; lets the
+        # heartbeat skip rewriting an unchanged idle diagnostics snapshot.
+        self._state_version = 0
+        # (version, metrics, last_request, recent_errors), rebuilt by writers
+        # under _stats_lock and swapped in with a single assignment so
+        # diagnostics readers never take the lock. Treat as read-only.
+        self._stats_snapshot = (0, dict(self._metrics), None, ())
+        self._idle_snapshot_version = None
 
         # Create IPC directory
-        if not os.path.exists(IPC_DIR):
-            os.makedirs(IPC_DIR)
+        os.makedirs(IPC_DIR, exist_ok=True)
 
     def _log(self, msg):
-        try:
-            if not os.path.exists(IPC_DIR):
-                os.makedirs(IPC_DIR)
-            with open(LOG_FILE, "a", encoding="utf-8") as f:
-                f.write("%s %s\n" % (time.strftime("%Y-%m-%d %H:%M:%S"), msg))
-        except Exception:
-            pass
+        line = "%s %s\n" % (time.strftime("%Y-%m-%d %H:%M:%S"), msg)
+        with self._log_lock:
+            try:
+                if self._log_file is None:
+                    os.makedirs(IPC_DIR, exist_ok=True)
+                    self._log_file = open(LOG_FILE, "a", encoding="utf-8", buffering=1)
+                self._log_file.write(line)
+            except Exception:
+                # Reopen on the next call (e.g. the directory was cleared)
+                self._close_log_locked()
+
+    def _close_log_locked(self):
+        if self._log_file is not None:
+            try:
+                self._log_file.close()
+            except Exception:
+                pass
+            self._log_file = None
 
     def start(self):
         """Start the server with polling"""
@@ -78,7 +382,10 @@ class MCPBridgeServer:
         # Clean up old files
         self._cleanup_files()
 
-        # Start polling thread (check every 100ms)
+        # Start polling thread; it sleeps until a request file shows up where
+        # the platform can tell us, otherwise it rescans every POLL_INTERVAL.
+        self._waiter = _create_waiter(IPC_DIR)
+        self._log("request waiter: %s" % type(self._waiter).__name__)
         self._thread = threading.Thread(target=self._poll_loop, daemon=True)
         self._thread.start()
         self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
@@ -92,20 +399,25 @@ class MCPBridgeServer:
     def stop(self):
         """Stop the server"""
         self._running = False
+        if self._waiter:
+            self._waiter.wake()
         if self._thread:
             self._thread.join(timeout=2.0)
             self._thread = None
+        waiter = self._waiter
+        if waiter:
+            # Unpublish first so threads finishing now don't pick it up
+            self._waiter = None
+            waiter.close()
+        self._release_worker()
         if self._heartbeat_thread:
             self._heartbeat_thread.join(timeout=2.0)
             self._heartbeat_thread = None
         self._cleanup_files()
-        # Remove heartbeat file
-        try:
-            if os.path.exists(HEARTBEAT_FILE):
-                os.remove(HEARTBEAT_FILE)
-        except Exception:
-            pass
+        _remove_quietly(HEARTBEAT_FILE)
         self._log("server stopped")
+        with self._log_lock:
+            self._close_log_locked()
         print("[MCP Bridge] Server stopped")
 
     def is_running(self):
@@ -114,35 +426,22 @@ class MCPBridgeServer:
 
     def _cleanup_files(self):
         """Remove IPC files"""
-        for f in [REQUEST_FILE, INFLIGHT_REQUEST_FILE, LOCK_FILE]:
-            try:
-                if os.path.exists(f):
-                    os.remove(f)
-            except Exception:
-                pass
-        for f in [DIAGNOSTICS_FILE]:
-            try:
-                if os.path.exists(f):
-                    os.remove(f)
-                if os.path.exists(f + ".tmp"):
-                    os.remove(f + ".tmp")
-            except Exception:
-                pass
+        self._pending_requests.clear()
+        for f in (
+            REQUEST_FILE,
+            INFLIGHT_REQUEST_FILE,
+            LOCK_FILE,
+            DIAGNOSTICS_FILE,
+            DIAGNOSTICS_FILE + ".tmp",
+        ):
+            _remove_quietly(f)
         # Remove shared and per-request response files from previous runs.
         try:
             for name in os.listdir(IPC_DIR):
-                lower = name.lower()
-                if (
-                    lower == "response.json"
-                    or lower == "response.json.tmp"
-                    or (lower.startswith(REQUEST_FILE_PREFIX) and lower.endswith(".json"))
-                    or (lower.startswith(REQUEST_FILE_PREFIX) and lower.endswith(".json.tmp"))
-                    or (lower.startswith(INFLIGHT_REQUEST_FILE_PREFIX) and lower.endswith(".json"))
-                    or (lower.startswith(INFLIGHT_REQUEST_FILE_PREFIX) and lower.endswith(".json.tmp"))
-                    or (lower.startswith(RESPONSE_FILE_PREFIX) and lower.endswith(".json"))
-                    or (lower.startswith(RESPONSE_FILE_PREFIX) and lower.endswith(".json.tmp"))
-                    or lower == "bridge_diagnostics.json"
-                    or lower == "bridge_diagnostics.json.tmp"
+                # request.*/response.* cover the legacy single-slot names and
+                # request.inflight.* as well
+                if name in _CLEANUP_NAMES or (
+                    name.startswith(_SPOOL_PREFIXES) and name.endswith(_SPOOL_SUFFIXES)
                 ):
                     path = os.path.join(IPC_DIR, name)
                     try:
@@ -156,13 +455,21 @@ class MCPBridgeServer:
         """Write response atomically using temp file + rename"""
         if not response_path:
             response_path = RESPONSE_FILE
-        self._write_json_atomic(response_path, response)
+        data = _encode_json(response)
+        # Per-request response files are new names, so on Linux they can be
+        # published without a visible temp file. The legacy shared slot may
+        # still hold an older response, which linkat can't replace.
+        if response_path == RESPONSE_FILE or not _link_file_bytes(response_path, data):
+            self._write_bytes_atomic(response_path, data)
 
     @staticmethod
     def _write_json_atomic(path, payload):
+        MCPBridgeServer._write_bytes_atomic(path, _encode_json(payload))
+
+    @staticmethod
+    def _write_bytes_atomic(path, data):
         tmp_path = path + ".tmp"
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f)
+        _write_file_bytes(tmp_path, data)
         os.replace(tmp_path, path)
 
     def _resolve_response_path(self, request):
@@ -177,30 +484,31 @@ class MCPBridgeServer:
             return RESPONSE_FILE
 
         candidate = candidate.strip()
-        if os.path.isabs(candidate):
-            path = os.path.normpath(candidate)
-        else:
-            path = os.path.normpath(os.path.join(IPC_DIR, candidate))
-
-        ipc_abs = os.path.abspath(IPC_DIR)
-        path_abs = os.path.abspath(path)
-        try:
-            in_ipc_dir = os.path.commonpath([ipc_abs, path_abs]) == ipc_abs
-        except ValueError:
-            in_ipc_dir = False
-        if not in_ipc_dir:
+        # join() keeps absolute candidates as-is; abspath() normalizes both
+        path_abs = os.path.abspath(os.path.join(_IPC_DIR_ABS, candidate))
+        path_norm = os.path.normcase(path_abs)
+        if path_norm != _IPC_DIR_NORM and not path_norm.startswith(_IPC_DIR_NORM_SEP):
             self._log("invalid response_file outside IPC_DIR: %s" % candidate)
             return RESPONSE_FILE
 
         return path_abs
 
     def _write_heartbeat(self):
-        """Write current timestamp to heartbeat file"""
+        """Write current timestamp to heartbeat file; returns it, or None."""
+        data = b"%.3f" % time.time()
         try:
-            with open(HEARTBEAT_FILE, "w") as f:
-                f.write("%.3f" % time.time())
+            _write_file_bytes(HEARTBEAT_FILE, data)
         except Exception:
-            pass
+            return None
+        return float(data)
+
+    @staticmethod
+    def _read_heartbeat():
+        try:
+            with open(HEARTBEAT_FILE, "r") as f:
+                return float(f.read().strip())
+        except Exception:
+            return None
 
     def _poll_loop(self):
         """Background thread that polls for requests"""
@@ -211,14 +519,17 @@ class MCPBridgeServer:
                 # Avoid flooding stdout/stderr; excessive prints can block and
                 # stall the bridge thread when no console is attached.
                 self._log("poll loop error: %s\n%s" % (str(e), traceback.format_exc()))
-            time.sleep(0.1)
+            waiter = self._waiter
+            if waiter is None:
+                break
+            waiter.wait(waiter.idle_wait)
 
     def _heartbeat_loop(self):
         """Dedicated heartbeat thread so heartbeat survives long/slow requests."""
         while self._running:
             try:
-                self._write_heartbeat()
-                self._write_diagnostics_snapshot()
+                heartbeat_ts = self._write_heartbeat()
+                self._write_diagnostics_snapshot(heartbeat_ts)
             except Exception:
                 pass
             time.sleep(HEARTBEAT_INTERVAL)
@@ -238,6 +549,47 @@ class MCPBridgeServer:
                     pass
         return timeout
 
+    @staticmethod
+    def _is_pending_request_name(name):
+        """True for request.json and request.<id>.json, not inflight files."""
+        return (
+            name.startswith(REQUEST_FILE_PREFIX)
+            and name.endswith(".json")
+            and not name.startswith(INFLIGHT_REQUEST_FILE_PREFIX)
+        )
+
+    def _scan_request_files(self):
+        """
+        Enumerate IPC_DIR once.
+
+        Returns (pending, inflight_count, legacy_present) where pending is a
+        list of (mtime, path) sorted oldest-first. The mtime comes from the
+        directory entry, which needs no extra stat call on Windows and at most
+        one per pending file elsewhere.
+        """
+        pending = []
+        inflight_count = 0
+        legacy_present = False
+        now = None
+        with os.scandir(IPC_DIR) as it:
+            for entry in it:
+                name = entry.name
+                if self._is_pending_request_name(name):
+                    if name == "request.json":
+                        legacy_present = True
+                    try:
+                        mtime = entry.stat(follow_symlinks=False).st_mtime
+                    except OSError:
+                        # Vanished/unreadable entries sort last
+                        if now is None:
+                            now = time.time()
+                        mtime = now
+                    pending.append((mtime, entry.path))
+                elif name.startswith(INFLIGHT_REQUEST_FILE_PREFIX) and name.endswith(".json"):
+                    inflight_count += 1
+        pending.sort()
+        return pending, inflight_count, legacy_present
+
     def _list_pending_request_files(self):
         """
         Return pending request file paths ordered oldest-first.
@@ -246,45 +598,42 @@ class MCPBridgeServer:
         - legacy single-slot request.json
         - per-request spool files request.<id>.json
         """
-        pending = []
         try:
-            for name in os.listdir(IPC_DIR):
-                lower = name.lower()
-                if lower == "request.json":
-                    pending.append(os.path.join(IPC_DIR, name))
-                    continue
-                if (
-                    lower.startswith(REQUEST_FILE_PREFIX)
-                    and lower.endswith(".json")
-                    and not lower.startswith(INFLIGHT_REQUEST_FILE_PREFIX)
-                ):
-                    pending.append(os.path.join(IPC_DIR, name))
+            pending = self._scan_request_files()[0]
         except Exception:
             return []
-
-        def _sort_key(path):
-            try:
-                return os.path.getmtime(path)
-            except Exception:
-                return time.time()
-
-        pending.sort(key=_sort_key)
-        return pending
+        return [path for _, path in pending]
 
     def _inflight_path_for_request_file(self, request_path):
         """Compute inflight file path for a claimed request file."""
         basename = os.path.basename(request_path)
-        lower = basename.lower()
-        if lower == "request.json":
+        if basename == "request.json":
             return INFLIGHT_REQUEST_FILE
 
         suffix = basename[len("request."):]
         return os.path.join(IPC_DIR, "%s%s" % (INFLIGHT_REQUEST_FILE_PREFIX, suffix))
 
     def _claim_next_request_file(self):
-        """Atomically claim the next pending request file for processing."""
-        for path in self._list_pending_request_files():
-            basename = os.path.basename(path).lower()
+        """
+        Atomically claim the next pending request file for processing.
+
+        The directory is only rescanned once the previous scan's backlog is
+        used up; os.replace stays the claim primitive, so entries another
+        process removed in the meantime are simply skipped.
+        """
+        pending = self._pending_requests
+        rescanned = False
+        while True:
+            if not pending:
+                # Stale leftovers don't hide files that arrived since
+                if rescanned:
+                    return None
+                pending.extend(self._list_pending_request_files())
+                rescanned = True
+                if not pending:
+                    return None
+            path = pending.popleft()
+            basename = os.path.basename(path)
 
             # Legacy compatibility: request.json may still be protected by lock.
             if basename == "request.json" and os.path.exists(LOCK_FILE):
@@ -299,29 +648,41 @@ class MCPBridgeServer:
             except OSError:
                 continue
 
-        return None
-
-    def _trim_recent_errors_locked(self, max_items=32):
-        if len(self._recent_errors) > max_items:
-            self._recent_errors = self._recent_errors[-max_items:]
-
-    def _record_recent_error(self, kind, request_id=None, method=None, message=""):
+    def _append_recent_error_locked(self, now, kind, request_id, method, message):
+        self._recent_errors.append(
+            {
+                "timestamp": now,
+                "kind": kind,
+                "request_id": request_id,
+                "method": method,
+                "message": message,
+            }
+        )
+
+    def _publish_stats_locked(self):
+        self._state_version += 1
+        self._stats_snapshot = (
+            self._state_version,
+            dict(self._metrics),
+            self._last_request,
+            tuple(self._recent_errors),
+        )
+
+    def _record_recent_error(
+        self, kind, request_id=None, method=None, message="", metric=None
+    ):
+        """Record an error; metric optionally names a counter to bump with it."""
         now = time.time()
         with self._stats_lock:
-            self._recent_errors.append(
-                {
-                    "timestamp": now,
-                    "kind": kind,
-                    "request_id": request_id,
-                    "method": method,
-                    "message": message,
-                }
-            )
-            self._trim_recent_errors_locked()
+            if metric is not None:
+                self._metrics[metric] += 1
+            self._append_recent_error_locked(now, kind, request_id, method, message)
+            self._publish_stats_locked()
 
     def _record_request_start(self, request_id, method):
         with self._stats_lock:
             self._metrics["total_received"] += 1
+            self._publish_stats_locked()
 
     def _mark_terminal_request_locked(self, request_id):
         if not request_id:
@@ -330,8 +691,8 @@ class MCPBridgeServer:
             return False
         self._terminal_request_ids.add(request_id)
         self._terminal_request_order.append(request_id)
-        if len(self._terminal_request_order) > 2048:
-            stale = self._terminal_request_order.pop(0)
+        if len(self._terminal_request_order) > _TERMINAL_REQUEST_LIMIT:
+            stale = self._terminal_request_order.popleft()
             self._terminal_request_ids.discard(stale)
         return True
 
@@ -342,15 +703,10 @@ class MCPBridgeServer:
         with self._stats_lock:
             if not self._mark_terminal_request_locked(request_id):
                 return
-            self._metrics["total_completed"] += 1
-            if status in ("error", "exception", "timeout"):
-                self._metrics["total_errors"] += 1
-            if status == "timeout":
-                self._metrics["total_timeouts"] += 1
-            if status == "stale_discarded":
-                self._metrics["total_stale_responses"] += 1
-            if status == "json_error":
-                self._metrics["total_json_errors"] += 1
+            metrics = self._metrics
+            metrics["total_completed"] += 1
+            for name in _STATUS_METRICS.get(status, ()):
+                metrics[name] += 1
             self._last_request = {
                 "timestamp": now,
                 "request_id": request_id,
@@ -359,75 +715,64 @@ class MCPBridgeServer:
                 "duration_sec": round(float(duration_sec), 4),
                 "error": error_message or "",
             }
-
-        if error_message:
-            self._record_recent_error(
-                "request_%s" % status,
-                request_id=request_id,
-                method=method,
-                message=error_message,
-            )
+            # Same critical section as the counters above
+            if error_message:
+                self._append_recent_error_locked(
+                    now, "request_%s" % status, request_id, method, error_message
+                )
+            self._publish_stats_locked()
 
     def _get_queue_snapshot(self):
-        pending = self._list_pending_request_files()
-        now = time.time()
-        oldest_age = None
-        for path in pending:
-            try:
-                age = now - os.path.getmtime(path)
-                if oldest_age is None or age > oldest_age:
-                    oldest_age = age
-            except Exception:
-                pass
-
-        inflight_count = 0
         try:
-            for name in os.listdir(IPC_DIR):
-                lower = name.lower()
-                if lower.startswith(INFLIGHT_REQUEST_FILE_PREFIX) and lower.endswith(".json"):
-                    inflight_count += 1
-            if os.path.exists(INFLIGHT_REQUEST_FILE):
-                inflight_count += 1
+            pending, inflight_count, legacy_present = self._scan_request_files()
         except Exception:
-            pass
+            pending, inflight_count, legacy_present = [], 0, False
+        oldest_age = None
+        if pending:
+            oldest_age = max(0.0, time.time() - pending[0][0])
 
         return {
             "pending_count": len(pending),
-            "legacy_request_present": os.path.exists(REQUEST_FILE),
+            "legacy_request_present": legacy_present,
             "inflight_count": inflight_count,
             "oldest_pending_age_sec": round(oldest_age, 3) if oldest_age is not None else None,
         }
 
     def get_diagnostics(self, include_recent_errors=True, max_recent_errors=16):
+        if include_recent_errors:
+            max_recent_errors = max(1, int(max_recent_errors))
+        else:
+            max_recent_errors = 0
+        return self._build_diagnostics(
+            max_recent_errors, self._get_queue_snapshot(), self._read_heartbeat()
+        )
+
+    def _build_diagnostics(self, max_recent_errors, queue_snapshot, heartbeat_ts):
         now = time.time()
+        mono_now = time.monotonic()
+        processing_since = self._processing_since
         processing_elapsed = None
-        if self._processing_since is not None:
-            processing_elapsed = max(0.0, now - self._processing_since)
-
-        with self._stats_lock:
-            metrics = dict(self._metrics)
-            last_request = dict(self._last_request) if self._last_request else None
-            recent_errors = list(self._recent_errors)
-
-        if include_recent_errors:
-            recent_errors = recent_errors[-max(1, int(max_recent_errors)) :]
+        if processing_since is not None:
+            processing_elapsed = max(0.0, mono_now - processing_since)
+
+        _, metrics, last_request, recent_errors = self._stats_snapshot
+        metrics = dict(metrics)
+        last_request = dict(last_request) if last_request else None
+        if max_recent_errors:
+            recent_errors = list(recent_errors[-max_recent_errors:])
         else:
             recent_errors = []
 
         heartbeat_age = None
-        try:
-            with open(HEARTBEAT_FILE, "r") as f:
-                ts = float(f.read().strip())
-            heartbeat_age = now - ts
-        except Exception:
-            heartbeat_age = None
+        if heartbeat_ts is not None:
+            heartbeat_age = now - heartbeat_ts
 
         return {
             "schema_version": "bridge_diagnostics.v1",
             "running": self._running,
-            "uptime_sec": round(max(0.0, now - self._started_at), 3),
+            "uptime_sec": round(max(0.0, mono_now - self._started_at), 3),
             "heartbeat_age_sec": round(heartbeat_age, 3) if heartbeat_age is not None else None,
-            "queue": self._get_queue_snapshot(),
+            "queue": queue_snapshot,
             "processing": {
                 "active": self._processing_since is not None,
                 "request_id": self._current_request_id,
@@ -445,13 +790,60 @@ class MCPBridgeServer:
             "recent_errors": recent_errors,
         }
 
-    def _write_diagnostics_snapshot(self):
+    def _write_diagnostics_snapshot(self, heartbeat_ts=None):
+        """
+        Refresh DIAGNOSTICS_FILE. While the bridge sits idle with nothing new
+        recorded the previous snapshot is still accurate (bar uptime), so the
+        encode and write are skipped; the heartbeat file carries liveness.
+
+        heartbeat_ts is the value the heartbeat thread just wrote, which
+        saves reading the file back.
+        """
         try:
-            payload = self.get_diagnostics(include_recent_errors=False, max_recent_errors=0)
+            queue_snapshot = self._get_queue_snapshot()
+            version = self._stats_snapshot[0]
+            idle = (
+                self._processing_since is None
+                and not queue_snapshot["pending_count"]
+                and not queue_snapshot["inflight_count"]
+            )
+            if idle and version == self._idle_snapshot_version:
+                return
+            if heartbeat_ts is None:
+                heartbeat_ts = self._read_heartbeat()
+            payload = self._build_diagnostics(0, queue_snapshot, heartbeat_ts)
             self._write_json_atomic(DIAGNOSTICS_FILE, payload)
+            self._idle_snapshot_version = version if idle else None
         except Exception:
             pass
 
+    def _worker_loop(self, work_queue):
+        """Run handler jobs from work_queue until it yields None."""
+        while True:
+            job = work_queue.get()
+            if job is None:
+                return
+            self._handle_request(*job)
+
+    def _dispatch_request(self, *job):
+        """Hand a claimed request to the long-lived worker thread."""
+        if self._work_queue is None:
+            self._work_queue = queue.Queue()
+            threading.Thread(
+                target=self._worker_loop, args=(self._work_queue,), daemon=True
+            ).start()
+        self._work_queue.put(job)
+
+    def _release_worker(self):
+        """
+        Let the current worker exit once its job returns. A timed-out handler
+        may never come back, so the next request gets a fresh worker instead
+        of queueing behind it.
+        """
+        if self._work_queue is not None:
+            self._work_queue.put(None)
+            self._work_queue = None
+
     def _poll_request(self):
         """Check for incoming request"""
         if not self._running:
@@ -459,7 +851,7 @@ class MCPBridgeServer:
 
         # Check if currently processing and whether it's timed out
         if self._processing_since is not None:
-            elapsed = time.time() - self._processing_since
+            elapsed = time.monotonic() - self._processing_since
             if elapsed < self._current_processing_timeout:
                 return  # Still processing, within timeout
             # Processing has been stuck too long - force reset and write error response
@@ -473,6 +865,7 @@ class MCPBridgeServer:
             self._current_request_method = None
             self._current_response_path = RESPONSE_FILE
             self._current_processing_timeout = PROCESSING_TIMEOUT
+            self._release_worker()
             # Write an error response so the client doesn't wait the full timeout
             try:
                 error_response = {
@@ -490,39 +883,44 @@ class MCPBridgeServer:
                 error_message="Handler timed out after %.0fs" % timeout_used,
             )
 
-        inflight_request_path = self._claim_next_request_file()
-        if not inflight_request_path:
-            return
+        # Requests that can't be started (bad JSON etc.) don't occupy the
+        # slot, so keep claiming until one is dispatched or the queue is
+        # empty instead of leaving the rest for the next wake.
+        while self._processing_since is None:
+            inflight_request_path = self._claim_next_request_file()
+            if not inflight_request_path:
+                return
+            self._start_claimed_request(inflight_request_path)
 
+    def _start_claimed_request(self, inflight_request_path):
+        """Read a claimed request file and hand the request to the worker."""
         try:
-            # Read request
-            with open(inflight_request_path, "r", encoding="utf-8") as f:
-                request = json.load(f)
-
-            # Remove claimed request file
+            # Read the claimed file and drop it straight away, before parsing,
+            # so no error path has to clean it up. (Unlinking while still open
+            # isn't allowed on Windows, hence close first.)
             try:
-                os.remove(inflight_request_path)
-            except OSError:
-                pass
+                with open(inflight_request_path, "rb", buffering=0) as f:
+                    raw = f.read()
+            finally:
+                try:
+                    os.remove(inflight_request_path)
+                except OSError:
+                    pass
+            request = _decode_json(raw)
 
             # Process request in a worker thread so the poll loop stays alive
             self._current_request_id = request.get("id")
             self._current_request_method = request.get("method")
             self._current_response_path = self._resolve_response_path(request)
-            self._processing_since = time.time()
+            self._processing_since = time.monotonic()
             self._current_processing_timeout = self._resolve_processing_timeout(request)
             self._record_request_start(self._current_request_id, self._current_request_method)
-            worker = threading.Thread(
-                target=self._handle_request,
-                args=(
-                    request,
-                    self._current_response_path,
-                    self._current_request_method,
-                    self._processing_since,
-                ),
-                daemon=True,
+            self._dispatch_request(
+                request,
+                self._current_response_path,
+                self._current_request_method,
+                self._processing_since,
             )
-            worker.start()
 
         except json.JSONDecodeError as e:
             # A partial/corrupt request can otherwise spin forever and flood logs.
@@ -530,19 +928,11 @@ class MCPBridgeServer:
             self._record_request_finish(
                 None, None, "json_error", duration_sec=0.0, error_message=str(e)
             )
-            try:
-                os.remove(inflight_request_path)
-            except Exception:
-                pass
         except Exception as e:
             self._log("error processing request: %s\n%s" % (str(e), traceback.format_exc()))
-            with self._stats_lock:
-                self._metrics["total_poll_errors"] += 1
-            self._record_recent_error("poll_error", message=str(e))
-            try:
-                os.remove(inflight_request_path)
-            except Exception:
-                pass
+            self._record_recent_error(
+                "poll_error", message=str(e), metric="total_poll_errors"
+            )
 
     def _handle_request(self, request, response_path, request_method, request_start_time):
         """Process a single request (runs in worker thread)"""
@@ -584,7 +974,11 @@ class MCPBridgeServer:
             error_message = str(e)
             self._log("error handling request: %s\n%s" % (str(e), traceback.format_exc()))
         finally:
-            duration = max(0.0, time.time() - request_start_time) if request_start_time else 0.0
+            duration = (
+                max(0.0, time.monotonic() - request_start_time)
+                if request_start_time is not None
+                else 0.0
+            )
             self._record_request_finish(
                 request_id,
                 request_method,
@@ -599,3 +993,7 @@ class MCPBridgeServer:
                 self._current_request_id = None
                 self._current_request_method = None
                 self._current_response_path = RESPONSE_FILE
+            # Requests queued behind this one can be claimed right away
+            waiter = self._waiter
+            if waiter is not None:
+                waiter.wake()
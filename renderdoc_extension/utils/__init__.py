@@ -5,5 +5,6 @@ Utility classes for RenderDoc operations.
 from .parsers import Parsers
 from .serializers import Serializers
 from .helpers import Helpers
+from .capture_cache import CaptureCache
 
-__all__ = ["Parsers", "Serializers", "Helpers"]
+__all__ = ["Parsers", "Serializers", "Helpers", "CaptureCache"]
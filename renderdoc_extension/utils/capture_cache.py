@@ -0,0 +1,54 @@
+"""
+Capture-scoped memoization for RenderDoc services.
+"""
+
+
+class CaptureCache:
+    """
+    Small keyed cache whose entries are dropped when the loaded capture changes.
+
+    Entries are only read/written from inside BlockInvoke callbacks, so all
+    access is already serialized on the replay thread.
+    """
+
+    def __init__(self, ctx):
+        self._ctx = ctx
+        self._capture_key = None
+        self._entries = {}
+
+    def _current_capture_key(self):
+        try:
+            return self._ctx.GetCaptureFilename()
+        except Exception:
+            return None
+
+    def _sync(self):
+        key = self._current_capture_key()
+        if key != self._capture_key:
+            self._entries.clear()
+            self._capture_key = key
+
+    def get(self, name, build_fn):
+        """Return the cached value for name, building it on first use."""
+        self._sync()
+        try:
+            return self._entries[name]
+        except KeyError:
+            value = build_fn()
+            self._entries[name] = value
+            return value
+
+    def has(self, name):
+        """Return True if name is cached for the current capture."""
+        self._sync()
+        return name in self._entries
+
+    def put(self, name, value):
+        """Store a value computed as a by-product of another capture walk."""
+        self._sync()
+        self._entries[name] = value
+
+    def clear(self):
+        """Drop all entries (e.g. after a capture was (re)loaded)."""
+        self._entries.clear()
+        self._capture_key = None
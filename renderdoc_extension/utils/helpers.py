@@ -9,14 +9,30 @@ class Helpers:
     """Common helper functions (static methods)"""
 
     @staticmethod
-    def flatten_actions(actions):
-        """Flatten hierarchical actions to a list"""
-        flat = []
-        for action in actions:
-            flat.append(action)
+    def iter_actions(actions, flag_mask=None):
+        """Yield actions depth-first, pre-order, without recursion.
+
+        If flag_mask is given, only actions with any of those flags set are
+        yielded; their children are still walked."""
+        # Each frame holds the remaining siblings at one depth.
+        stack = [iter(actions)]
+        while stack:
+            action = next(stack[-1], None)
+            if action is None:
+                stack.pop()
+                continue
+            if flag_mask is None or action.flags & flag_mask:
+                yield action
             if action.children:
-                flat.extend(Helpers.flatten_actions(action.children))
-        return flat
+                stack.append(iter(action.children))
+
+    @staticmethod
+    def flatten_actions(actions, flag_mask=None):
+        """Flatten hierarchical actions to a list (depth-first, pre-order).
+
+        If flag_mask is given, only actions with any of those flags set are
+        kept, filtering during the walk instead of building the full list."""
+        return list(Helpers.iter_actions(actions, flag_mask))
 
     @staticmethod
     def count_children(action):
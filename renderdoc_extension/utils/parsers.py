@@ -42,3 +42,18 @@ class Parsers:
         if "::" in resource_id_str:
             return int(resource_id_str.split("::")[-1])
         return int(resource_id_str)
+
+    @staticmethod
+    def resource_id_str(key):
+        """Format a resource_key() the way str(ResourceId) does, without
+        another call into the bindings"""
+        return "ResourceId::%d" % key
+
+    @staticmethod
+    def resource_key(resource_id):
+        """Return a hashable integer key for a ResourceId"""
+        try:
+            return int(resource_id)
+        except (TypeError, ValueError):
+            # Older bindings only expose the "ResourceId::123" string form
+            return Parsers.extract_numeric_id(str(resource_id))
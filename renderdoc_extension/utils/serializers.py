@@ -5,6 +5,19 @@ Serialization utility functions for RenderDoc data types.
 import renderdoc as rd
 
 
+# VarType -> ShaderValue array holding its components; one dict lookup per
+# variable instead of an if/elif chain of enum compares.
+_VAR_VALUE_ATTRS = {}
+for _type_name, _value_attr in (("Float", "f32v"), ("Int", "s32v"), ("UInt", "u32v")):
+    _var_type = getattr(rd.VarType, _type_name, None)
+    if _var_type is not None:
+        _VAR_VALUE_ATTRS[_var_type] = _value_attr
+del _type_name, _value_attr, _var_type
+
+# VarType -> str(VarType), filled on first use
+_VAR_TYPE_NAMES = {}
+
+
 class Serializers:
     """Serialization utility functions (static methods)"""
 
@@ -43,35 +56,89 @@ class Serializers:
         """Serialize shader variables to JSON format"""
         result = []
         for var in variables:
+            var_type = var.type
+            type_name = _VAR_TYPE_NAMES.get(var_type)
+            if type_name is None:
+                type_name = _VAR_TYPE_NAMES[var_type] = str(var_type)
+            rows = var.rows
+            columns = var.columns
             var_info = {
                 "name": var.name,
-                "type": str(var.type),
-                "rows": var.rows,
-                "columns": var.columns,
+                "type": type_name,
+                "rows": rows,
+                "columns": columns,
             }
 
             # Get value based on type
-            try:
-                if var.type == rd.VarType.Float:
-                    count = var.rows * var.columns
-                    var_info["value"] = list(var.value.f32v[:count])
-                elif var.type == rd.VarType.Int:
-                    count = var.rows * var.columns
-                    var_info["value"] = list(var.value.s32v[:count])
-                elif var.type == rd.VarType.UInt:
-                    count = var.rows * var.columns
-                    var_info["value"] = list(var.value.u32v[:count])
-            except Exception:
-                pass
+            value_attr = _VAR_VALUE_ATTRS.get(var_type)
+            if value_attr is not None:
+                try:
+                    var_info["value"] = list(
+                        getattr(var.value, value_attr)[: rows * columns]
+                    )
+                except Exception:
+                    pass
 
             # Nested members
-            if var.members:
-                var_info["members"] = Serializers.serialize_variables(var.members)
+            members = var.members
+            if members:
+                var_info["members"] = Serializers.serialize_variables(members)
 
             result.append(var_info)
 
         return result
 
+    @staticmethod
+    def variable_layout(variables):
+        """Capture the fixed part of a variable list (names, types, shapes)
+        so later readbacks of the same cbuffer only have to copy values."""
+        layout = []
+        for var in variables:
+            var_type = var.type
+            type_name = _VAR_TYPE_NAMES.get(var_type)
+            if type_name is None:
+                type_name = _VAR_TYPE_NAMES[var_type] = str(var_type)
+            rows = var.rows
+            columns = var.columns
+            members = var.members
+            layout.append((
+                var.name,
+                type_name,
+                rows,
+                columns,
+                _VAR_VALUE_ATTRS.get(var_type),
+                rows * columns,
+                Serializers.variable_layout(members) if members else None,
+            ))
+        return tuple(layout)
+
+    @staticmethod
+    def serialize_variables_with_layout(variables, layout):
+        """serialize_variables() for a list matching a variable_layout();
+        falls back to the generic path if the shape doesn't match."""
+        if len(variables) != len(layout):
+            return Serializers.serialize_variables(variables)
+        result = [None] * len(layout)
+        for i, (var, entry) in enumerate(zip(variables, layout)):
+            name, type_name, rows, columns, value_attr, count, member_layout = entry
+            var_info = {
+                "name": name,
+                "type": type_name,
+                "rows": rows,
+                "columns": columns,
+            }
+            if value_attr is not None:
+                try:
+                    var_info["value"] = list(getattr(var.value, value_attr)[:count])
+                except Exception:
+                    pass
+            if member_layout is not None:
+                var_info["members"] = Serializers.serialize_variables_with_layout(
+                    var.members, member_layout
+                )
+            result[i] = var_info
+        return result
+
     @staticmethod
     def serialize_actions(
         actions,
@@ -4,14 +4,15 @@ Simple stress harness for RenderDoc MCP file-based bridge.
 Usage:
   python scripts/stress_bridge.py --threads 8 --requests 200
   python scripts/stress_bridge.py --method get_bridge_diagnostics --requests 50
+
+One untimed warm-up call (--warmup) runs first so first-call costs don't
+skew the summary.
 """
 
 import argparse
 import json
 import os
-import statistics
 import sys
-import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -33,6 +34,12 @@ def parse_args():
     )
     parser.add_argument("--threads", type=int, default=8, help="Concurrent worker threads")
     parser.add_argument("--requests", type=int, default=200, help="Total request count")
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="Untimed calls to make before the measured run (default: 1)",
+    )
     parser.add_argument(
         "--show-errors",
         type=int,
@@ -47,6 +54,23 @@ def parse_args():
     return parser.parse_args()
 
 
+def latency_summary_ms(latencies):
+    """min/p50/p95/max in milliseconds from a single sort of the samples."""
+    if not latencies:
+        return {"min": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(latencies)
+    n = len(ordered)
+    mid = n // 2
+    p50 = ordered[mid] if n % 2 else (ordered[mid - 1] + ordered[mid]) / 2.0
+    p95 = ordered[int(n * 0.95) - 1] if n > 1 else ordered[0]
+    return {
+        "min": round(ordered[0] * 1000.0, 2),
+        "p50": round(p50 * 1000.0, 2),
+        "p95": round(p95 * 1000.0, 2),
+        "max": round(ordered[-1] * 1000.0, 2),
+    }
+
+
 def main():
     args = parse_args()
     try:
@@ -58,7 +82,6 @@ def main():
         raise SystemExit("--params must decode to a JSON object")
 
     bridge = RenderDocBridge()
-    lock = threading.Lock()
     latencies = []
     errors = {}
     successes = 0
@@ -74,18 +97,24 @@ def main():
             elapsed = time.perf_counter() - start
             return False, elapsed, str(exc)
 
+    for _ in range(max(0, args.warmup)):
+        try:
+            bridge.call(args.method, params)
+        except Exception:
+            pass
+
     started_at = time.time()
     with ThreadPoolExecutor(max_workers=max(1, args.threads)) as executor:
         futures = [executor.submit(run_once, i) for i in range(max(1, args.requests))]
         for future in as_completed(futures):
+            # Only this thread aggregates results, so no lock is needed
             ok, elapsed, err = future.result()
-            with lock:
-                latencies.append(elapsed)
-                if ok:
-                    successes += 1
-                else:
-                    failures += 1
-                    errors[err] = errors.get(err, 0) + 1
+            latencies.append(elapsed)
+            if ok:
+                successes += 1
+            else:
+                failures += 1
+                errors[err] = errors.get(err, 0) + 1
 
     duration = max(0.0001, time.time() - started_at)
     summary = {
@@ -98,17 +127,7 @@ def main():
         "successes": successes,
         "failures": failures,
         "failure_rate": round((failures / max(1, args.requests)) * 100.0, 2),
-        "latency_ms": {
-            "min": round(min(latencies) * 1000.0, 2) if latencies else 0.0,
-            "p50": round(statistics.median(latencies) * 1000.0, 2) if latencies else 0.0,
-            "p95": round(
-                sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000.0
-                if len(latencies) > 1
-                else (latencies[0] * 1000.0 if latencies else 0.0),
-                2,
-            ),
-            "max": round(max(latencies) * 1000.0, 2) if latencies else 0.0,
-        },
+        "latency_ms": latency_summary_ms(latencies),
         "top_errors": sorted(errors.items(), key=lambda x: x[1], reverse=True)[: args.show_errors],
     }
 